@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+
+import numpy as np
+import pygame
+from pygame import mixer
+
+log = logging.getLogger(__name__)
+
+# Optional asset files, looked up next to this module and never written
+SOUND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
+
+SOUND_FILES = {
+    "capture": "capture.wav",
+    "evolve": "evolve.wav",
+    "victory": "victory.wav",
+    "game_over": "game_over.wav",
+    "power_up": "power_up.wav",
+    "background": "background.wav",
+}
+
+# Effects that get a mixer channel of their own so bursts never steal each other's
+RESERVED_CHANNELS = ("capture", "evolve", "power_up")
+
+# Fallback tones: (start Hz, end Hz, seconds) segments played back to back
+FALLBACK_TONES = {
+    "capture": [(880, 1320, 0.08)],
+    "evolve": [(523, 523, 0.07), (659, 659, 0.07), (784, 784, 0.07), (1047, 1047, 0.1)],
+    "power_up": [(400, 1200, 0.25)],
+    "victory": [(523, 523, 0.15), (659, 659, 0.15), (784, 784, 0.15), (1047, 1047, 0.3)],
+    "game_over": [(440, 440, 0.2), (349, 349, 0.2), (262, 262, 0.4)],
+}
+
+
+class AudioManager:
+    """Lazily loaded, cached sound effects.
+
+    A sound is decoded the first time it is played, or ahead of time on a
+    background thread via ``preload_async()``. When an asset file is missing
+    or unreadable, a short tone is synthesized in memory instead, so nothing
+    is ever written to disk. If the mixer can't start at all the manager
+    stays silent.
+    """
+
+    def __init__(self, sound_dir=SOUND_DIR, volume=0.5):
+        self.sound_dir = sound_dir
+        self.volume = volume
+        self._sounds = {}
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.enabled = self._init_mixer()
+
+    def _init_mixer(self):
+        try:
+            if not mixer.get_init():
+                mixer.init()
+        except pygame.error as exc:
+            log.warning("sound disabled: %s", exc)
+            return False
+
+        mixer.set_reserved(len(RESERVED_CHANNELS))
+        for i, name in enumerate(RESERVED_CHANNELS):
+            self._channels[name] = mixer.Channel(i)
+        return True
+
+    def preload_async(self, names=SOUND_FILES, loop=None):
+        """Decode sounds on a daemon thread so the first frame doesn't wait.
+
+        ``loop`` names a sound to start looping once everything is loaded,
+        typically the background music.
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._preload, args=(list(names), loop),
+                                         name="audio-preload", daemon=True)
+        self._thread.start()
+
+    def _preload(self, names, loop):
+        for name in names:
+            self.get(name)
+        if loop:
+            self.play(loop, loops=-1)
+
+    # The decoded sound, or None if it has neither an asset nor a fallback
+    def get(self, name):
+        if name in self._sounds or not self.enabled:
+            return self._sounds.get(name)
+        with self._lock:
+            if name not in self._sounds:
+                sound = self._load(name)
+                if sound is not None:
+                    sound.set_volume(self.volume)
+                self._sounds[name] = sound
+        return self._sounds[name]
+
+    def play(self, name, loops=0):
+        sound = self.get(name)
+        if sound is None:
+            return
+        channel = self._channels.get(name)
+        try:
+            if channel is not None:
+                channel.play(sound, loops)
+            else:
+                sound.play(loops)
+        except pygame.error as exc:
+            log.warning("could not play %s: %s", name, exc)
+
+    def _load(self, name):
+        filename = SOUND_FILES.get(name)
+        if filename:
+            path = os.path.join(self.sound_dir, filename)
+            if os.path.exists(path):
+                try:
+                    sound = mixer.Sound(path)
+                    if sound.get_length() > 0:
+                        return sound
+                except (pygame.error, OSError) as exc:
+                    log.warning("could not load %s: %s", path, exc)
+        return synthesize(name)
+
+
+def synthesize(name):
+    """Build the fallback tone for a sound in memory, or None if it has none."""
+    segments = FALLBACK_TONES.get(name)
+    if not segments:
+        return None
+
+    frequency, size, channels = mixer.get_init()
+    pieces = []
+    for start_hz, end_hz, seconds in segments:
+        n = int(frequency * seconds)
+        pitch = np.linspace(start_hz, end_hz, n)
+        phase = 2 * np.pi * np.cumsum(pitch) / frequency
+        # Quick attack and linear fade so segments don't click
+        envelope = np.minimum(1, np.arange(n) / (0.005 * frequency)) * np.linspace(1, 0, n)
+        pieces.append(np.sin(phase) * envelope)
+    wave = np.concatenate(pieces) * 0.4
+
+    # Match the mixer's sample format: negative sizes are signed, 32 is float
+    if abs(size) == 32:
+        samples = wave.astype(np.float32)
+    else:
+        bits = abs(size)
+        scale = 2 ** (bits - 1) - 1
+        if size < 0:
+            samples = (wave * scale).astype(np.int8 if bits == 8 else np.int16)
+        else:
+            samples = (wave * scale + scale + 1).astype(np.uint8 if bits == 8 else np.uint16)
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return mixer.Sound(buffer=np.ascontiguousarray(samples).tobytes())
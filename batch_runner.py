@@ -0,0 +1,203 @@
+"""Run many headless games across a process pool for scoring and balance sweeps.
+
+Every combination of the swept config values is played once per seed by a
+bot. Games are handed to workers in chunks and results stream back chunk by
+chunk, so memory stays flat however many games a sweep runs.
+
+Run from the repository root, e.g.:
+
+    python batch_runner.py --seeds 200 --durations 30,60 --thresholds 2,4,6 3,6,9
+"""
+import argparse
+import dataclasses
+import itertools
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+from bots import BOTS
+from game_state import FPS, GameConfig, GameState
+from scores import MAX_SEED, ScoreEntry, ScoreStore
+
+
+@dataclasses.dataclass
+class GameResult:
+    """Outcome of one headless game."""
+    config: GameConfig
+    seed: int
+    score: int
+    victory: bool
+    frames: int
+    birds_captured: int
+    evolution_frames: list  # frame each form was reached, None if never
+
+
+def run_game(config, seed, bot="greedy"):
+    state = GameState(config, seed=seed)
+    player = BOTS[bot](seed)
+    evolution_frames = [None] * len(config.evolution_thresholds)
+
+    while not state.game_over:
+        for name, level in state.step(player(state)):
+            if name == "evolve":
+                evolution_frames[level - 1] = state.frame
+
+    return GameResult(config, seed, state.score, state.victory, state.frame,
+                      state.birds_captured, evolution_frames)
+
+
+# Worker entry point: play one chunk of (config, seed) jobs
+def _run_chunk(args):
+    jobs, bot = args
+    return [run_game(config, seed, bot) for config, seed in jobs]
+
+
+def _chunks(jobs, size):
+    iterator = iter(jobs)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sweep(configs, seeds, bot="greedy", processes=None, chunk_size=16):
+    """Play every config against every seed and yield ``GameResult``s as they finish.
+
+    Results arrive in completion order, not submission order. With
+    ``processes=1`` everything runs in this process, which is handy for
+    profiling.
+    """
+    jobs = ((config, seed) for config in configs for seed in seeds)
+    chunks = ((chunk, bot) for chunk in _chunks(jobs, chunk_size))
+
+    if processes == 1:
+        for chunk in chunks:
+            yield from _run_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap_unordered(_run_chunk, chunks):
+            yield from results
+
+
+def config_grid(base=None, **values):
+    """Every combination of the given ``GameConfig`` field values."""
+    base = base or GameConfig()
+    names = list(values)
+    for combo in itertools.product(*(values[name] for name in names)):
+        yield dataclasses.replace(base, **dict(zip(names, combo)))
+
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(results):
+    """Aggregate results into summary statistics per distinct config."""
+    groups = {}
+    for result in results:
+        key = json.dumps(dataclasses.asdict(result.config), sort_keys=True)
+        groups.setdefault(key, []).append(result)
+
+    summaries = []
+    for key, group in groups.items():
+        scores = sorted(r.score for r in group)
+        summary = {
+            'config': json.loads(key),
+            'games': len(group),
+            'victory_rate': sum(r.victory for r in group) / len(group),
+            'score_mean': statistics.fmean(scores),
+            'score_median': statistics.median(scores),
+            'score_p95': _percentile(scores, 0.95),
+            'seconds_mean': statistics.fmean(r.frames for r in group) / FPS,
+            'evolutions': [],
+        }
+        for level in range(len(group[0].evolution_frames)):
+            reached = [r.evolution_frames[level] for r in group if r.evolution_frames[level] is not None]
+            summary['evolutions'].append({
+                'level': level + 1,
+                'reached_rate': len(reached) / len(group),
+                'seconds_mean': statistics.fmean(reached) / FPS if reached else None,
+            })
+        summaries.append(summary)
+    return summaries
+
+
+def score_entry(result, player):
+    evolution = sum(frame is not None for frame in result.evolution_frames)
+    return ScoreEntry(result.score, result.seed, player, result.victory, evolution, result.birds_captured,
+                      result.frames, result.config.num_birds, result.config.game_duration)
+
+
+def _csv(cast):
+    return lambda text: [cast(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=100, help="games per config")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--bot", choices=sorted(BOTS), default="greedy")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--birds", type=_csv(int), default=[6])
+    parser.add_argument("--durations", type=_csv(int), default=[60], help="game_duration values, seconds")
+    parser.add_argument("--speeds", type=_csv(int), nargs="+", default=[(5, 6, 7, 8)],
+                        help="player speed per form, e.g. 5,6,7,8")
+    parser.add_argument("--thresholds", type=_csv(int), nargs="+", default=[(2, 4, 6)],
+                        help="captures to reach cat,hawk,phoenix, e.g. 2,4,6")
+    parser.add_argument("--power-up-chance", type=_csv(float), default=[0.005])
+    parser.add_argument("--json", metavar="PATH", help="write the summary as JSON")
+    parser.add_argument("--scores", metavar="PATH", help="also save every game to this high-score database")
+    args = parser.parse_args(argv)
+
+    configs = list(config_grid(
+        num_birds=args.birds,
+        game_duration=args.durations,
+        player_speeds=[tuple(s) for s in args.speeds],
+        evolution_thresholds=[tuple(t) for t in args.thresholds],
+        power_up_chance=args.power_up_chance,
+    ))
+    if args.first_seed < 0 or args.first_seed + args.seeds - 1 > MAX_SEED:
+        parser.error(f"seeds must stay between 0 and {MAX_SEED}")
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    total = len(configs) * len(seeds)
+
+    scores = ScoreStore(args.scores) if args.scores else None
+    start = time.perf_counter()
+    results = []
+    for result in sweep(configs, seeds, args.bot, args.processes, args.chunk_size):
+        results.append(result)
+        if scores:
+            scores.add(score_entry(result, args.bot))
+        if len(results) % 500 == 0:
+            print(f"{len(results)}/{total} games", file=sys.stderr)
+    if scores:
+        scores.close()
+    elapsed = time.perf_counter() - start
+
+    summaries = summarize(results)
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:.0f} games/s, {args.processes} processes)")
+    for summary in summaries:
+        config = summary['config']
+        evolutions = ", ".join(
+            f"L{e['level']} {e['reached_rate']:.0%}" + (f" @{e['seconds_mean']:.1f}s" if e['seconds_mean'] else "")
+            for e in summary['evolutions'])
+        print(f"birds={config['num_birds']} duration={config['game_duration']} "
+              f"speeds={config['player_speeds']} thresholds={config['evolution_thresholds']} "
+              f"power_up={config['power_up_chance']}: victory {summary['victory_rate']:.0%}, "
+              f"score mean {summary['score_mean']:.0f} p95 {summary['score_p95']}, {evolutions}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'elapsed_seconds': elapsed, 'summaries': summaries}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
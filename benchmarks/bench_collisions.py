@@ -0,0 +1,64 @@
+"""Compare the spatial-hash capture check against the original brute-force scan.
+
+Run from the repository root:
+
+    python benchmarks/bench_collisions.py [bird counts...]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from game_state import WIDTH, PLAY_AREA_HEIGHT, capture_radius  # noqa: E402
+from spatial_hash import SpatialHash  # noqa: E402
+
+
+def make_birds(n, rng):
+    return [{'x': rng.randint(50, WIDTH - 50), 'y': rng.randint(50, PLAY_AREA_HEIGHT - 50), 'captured': False}
+            for _ in range(n)]
+
+
+# The capture check as the game originally wrote it
+def brute_force(birds, px, py):
+    hits = []
+    for i, bird in enumerate(birds):
+        if not bird['captured']:
+            distance = ((px - bird['x']) ** 2 + (py - bird['y']) ** 2) ** 0.5
+            if distance < capture_radius:
+                hits.append(i)
+    return hits
+
+
+def spatial(grid, birds, px, py):
+    reach = capture_radius * capture_radius
+    hits = []
+    for i in sorted(grid.query(px, py, capture_radius)):
+        dx = px - birds[i]['x']
+        dy = py - birds[i]['y']
+        if dx * dx + dy * dy < reach:
+            hits.append(i)
+    return hits
+
+
+def run(counts, repeat=200):
+    rng = random.Random(0)
+    probes = [(rng.randint(30, WIDTH - 30), rng.randint(30, PLAY_AREA_HEIGHT - 30)) for _ in range(repeat)]
+    print(f"{'birds':>8} {'brute us':>10} {'grid us':>10} {'speedup':>8}")
+    for n in counts:
+        birds = make_birds(n, rng)
+        grid = SpatialHash(capture_radius)
+        for i, bird in enumerate(birds):
+            grid.insert(i, bird['x'], bird['y'])
+
+        for px, py in probes[:20]:
+            assert brute_force(birds, px, py) == spatial(grid, birds, px, py)
+
+        brute = timeit.timeit(lambda: [brute_force(birds, px, py) for px, py in probes], number=1) / repeat
+        fast = timeit.timeit(lambda: [spatial(grid, birds, px, py) for px, py in probes], number=1) / repeat
+        print(f"{n:>8} {brute * 1e6:>10.1f} {fast * 1e6:>10.1f} {brute / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [6, 60, 600, 6000, 60000])
@@ -0,0 +1,158 @@
+"""Load-test the multiplayer server with simulated clients on this machine.
+
+For each client count, a server process runs a match while client
+processes drive headless ``MatchClient``s with random held inputs, doing
+the full decode, prediction and interpolation work every tick. Clients
+press restart as soon as a match ends, so the load stays on live play;
+``live_ticks`` reports how many measured ticks stepped a match in
+progress. Reports server tick times and snapshot bandwidth as JSON.
+
+Run from the repository root:
+
+    python benchmarks/bench_multiplayer.py --clients 8 16 32 64 --seconds 10
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import numpy as np  # noqa: E402
+
+from bots import RandomBot  # noqa: E402
+from client import MatchClient  # noqa: E402
+from game_state import FPS, GameConfig, Inputs  # noqa: E402
+from server import MatchServer  # noqa: E402
+
+# Simulated clients per client process
+CLIENTS_PER_PROCESS = 16
+
+
+def serve(ready, results, seconds, birds, warmup):
+    server = MatchServer(port=0, config=GameConfig(num_birds=birds, game_duration=int(seconds) + 60), seed=0)
+    ready.put(server.address[1])
+    server.serve(warmup)
+    sent, packets, full = server.bytes_sent, server.packets_sent, server.full_snapshots
+    first_tick, first_live = server.ticks, server.live_ticks
+    server.serve(seconds)
+    server.close()
+    tick_ms = np.array(list(server.tick_ms)[-(server.ticks - first_tick):])
+    results.put({
+        'ticks': server.ticks - first_tick,
+        'live_ticks': server.live_ticks - first_live,
+        'connected': len(server.connections),
+        'tick_ms': tick_ms.tolist(),
+        'bytes_sent': server.bytes_sent - sent,
+        'packets_sent': server.packets_sent - packets,
+        'full_snapshots': server.full_snapshots - full,
+    })
+
+
+def play(port, count, seconds, seed, results):
+    clients = [MatchClient(port=port) for _ in range(count)]
+    for client in clients:
+        if not client.join():
+            raise RuntimeError("server didn't answer")
+    bots = [RandomBot(seed + i) for i in range(count)]
+    restart = Inputs(restart=True)
+
+    interval = 1 / FPS
+    deadline = time.perf_counter() + seconds
+    next_tick = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for client, bot in zip(clients, bots):
+            client.poll()
+            if client.latest is not None:
+                # Start the next match straight away rather than measure an idle one
+                client.send_input(restart if client.latest.game_over else bot(client.latest))
+                client.advance()
+                client.interpolated()
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    results.put({
+        'bytes_received': sum(c.bytes_received for c in clients),
+        'snapshots': sum(c.snapshots for c in clients),
+        'corrections': sum(c.corrections for c in clients),
+        'inputs_sent': sum(c.seq for c in clients),
+    })
+    for client in clients:
+        client.close()
+
+
+def run(clients, seconds, birds, warmup=2.0):
+    ready, results, client_results = multiprocessing.Queue(), multiprocessing.Queue(), multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ready, results, seconds, birds, warmup))
+    server.start()
+    # Timeouts so a crashed child fails the run instead of hanging it
+    limit = seconds + warmup + 30
+    port = ready.get(timeout=limit)
+
+    groups = [min(CLIENTS_PER_PROCESS, clients - i) for i in range(0, clients, CLIENTS_PER_PROCESS)]
+    players = [multiprocessing.Process(target=play, args=(port, n, seconds + warmup + 1, i * 1000, client_results))
+               for i, n in enumerate(groups)]
+    for process in players:
+        process.start()
+
+    stats = results.get(timeout=limit)
+    totals = [client_results.get(timeout=limit) for _ in players]
+    for process in players + [server]:
+        process.join()
+
+    tick_ms = np.array(stats['tick_ms'])
+    elapsed = stats['ticks'] / FPS
+    received = sum(t['snapshots'] for t in totals)
+    return {
+        'clients': clients,
+        'connected': stats['connected'],
+        'birds': birds,
+        'ticks': stats['ticks'],
+        'live_ticks': stats['live_ticks'],
+        'tick_p50_ms': float(np.percentile(tick_ms, 50)),
+        'tick_p95_ms': float(np.percentile(tick_ms, 95)),
+        'tick_p99_ms': float(np.percentile(tick_ms, 99)),
+        'tick_max_ms': float(tick_ms.max()),
+        'server_kb_per_s': stats['bytes_sent'] / elapsed / 1024,
+        'per_client_kb_per_s': stats['bytes_sent'] / elapsed / 1024 / clients,
+        'mean_snapshot_bytes': stats['bytes_sent'] / max(1, stats['packets_sent']),
+        'full_snapshots': stats['full_snapshots'],
+        'snapshots_received': received,
+        'prediction_corrections': sum(t['corrections'] for t in totals),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--birds", type=int, default=GameConfig.num_birds)
+    parser.add_argument("--output", "-o", help="write results as JSON to this path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for clients in args.clients:
+        result = run(clients, args.seconds, args.birds)
+        results.append(result)
+        print(f"{clients:3d} clients: tick p50 {result['tick_p50_ms']:.3f} ms  p99 {result['tick_p99_ms']:.3f} ms  "
+              f"{result['per_client_kb_per_s']:.1f} KB/s per client  "
+              f"{result['mean_snapshot_bytes']:.0f} B/snapshot  "
+              f"{result['live_ticks']}/{result['ticks']} ticks live", file=sys.stderr)
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
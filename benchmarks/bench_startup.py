@@ -0,0 +1,70 @@
+"""Time cold starts of the game, from process launch to exit after one frame.
+
+Every case runs the game in a fresh interpreter, so imports, subsystem
+initialization and the first frame are all counted, and reports the
+median wall time over ``--runs`` launches as JSON. ``python`` is the bare
+interpreter for reference.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+GAME = os.path.join(ROOT, "bird_catcher_game.py")
+
+# Case name -> interpreter arguments
+CASES = {
+    "python": ["-c", "pass"],
+    "import": ["-c", "import bird_catcher_game"],
+    "headless": [GAME, "--headless", "--frames", "1", "--seed", "0", "--no-scores"],
+    "window_muted": [GAME, "--frames", "1", "--mute", "--seed", "0", "--no-scores"],
+    "window": [GAME, "--frames", "1", "--seed", "0", "--no-scores"],
+}
+
+
+def time_launch(args):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(cases, runs):
+    results = {}
+    for name in cases:
+        time_launch(CASES[name])  # warm the OS file cache
+        times = [time_launch(CASES[name]) for _ in range(runs)]
+        results[name] = {'median_ms': statistics.median(times), 'min_ms': min(times), 'max_ms': max(times)}
+        print(f"{name:14s} {results[name]['median_ms']:7.1f} ms", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="only run these")
+    parser.add_argument("--output", "-o", help="write results as JSON to this path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run(args.case or list(CASES), args.runs)
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
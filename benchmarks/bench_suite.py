@@ -0,0 +1,222 @@
+"""Time every rendering and simulation hot path under the SDL dummy driver.
+
+Each benchmark runs once per scenario it applies to. Results (timings in
+milliseconds plus per-call allocation counts from tracemalloc) are written
+as JSON, and can be checked against an earlier run for regressions.
+
+Run from the repository root:
+
+    python benchmarks/bench_suite.py --output bench.json
+    python benchmarks/bench_suite.py --compare bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import pygame  # noqa: E402
+
+from game_state import GameConfig, GameState, PLAY_AREA_HEIGHT, WIDTH  # noqa: E402
+from quality import QUALITY_LEVELS  # noqa: E402
+from snapshot import restore, snapshot  # noqa: E402
+
+# Scenario name -> how to set the game up before timing
+SCENARIOS = {
+    "birds_6": {'num_birds': 6},
+    "birds_600": {'num_birds': 600},
+    "birds_60k": {'num_birds': 60000},
+    "sparkle_burst": {'num_birds': 6, 'sparkle_bursts': 500},
+    "phoenix_trail": {'num_birds': 6, 'evolution': 3, 'full_trail': True, 'max_trail_length': 200},
+    # The worst case for the frame budget: everything at once
+    "phoenix_burst": {'num_birds': 600, 'evolution': 3, 'full_trail': True, 'max_trail_length': 200,
+                      'sparkle_bursts': 500},
+}
+
+# Benchmarks that only make sense for some scenarios
+BIRD_SCENARIOS = ("birds_6", "birds_600", "birds_60k")
+
+
+def make_scene(scenario):
+    from renderer import Renderer, HEIGHT
+
+    spec = SCENARIOS[scenario]
+    config = GameConfig(num_birds=spec['num_birds'],
+                        max_trail_length=spec.get('max_trail_length', GameConfig.max_trail_length))
+    state = GameState(config, seed=0)
+    state.player_evolution = spec.get('evolution', 0)
+
+    screen = pygame.display.get_surface() or pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = Renderer(screen, pygame.font.Font(None, 36), seed=0)
+
+    if spec.get('full_trail'):
+        for i in range(config.max_trail_length):
+            state.trail.append((100 + i * 2 % (WIDTH - 200), 100 + i % (PLAY_AREA_HEIGHT - 200)))
+    return state, renderer
+
+
+# A full frame at one render quality, with the sparkle bursts kept topped up
+def quality_frame(level):
+    def factory(state, renderer):
+        renderer.set_quality(level)
+        bursts = SCENARIOS["phoenix_burst"]['sparkle_bursts']
+
+        def frame():
+            if len(renderer.sparkles) < bursts:
+                refill_sparkles(renderer, bursts)
+            renderer.tick(state.step())
+            renderer.draw(state)
+        return frame
+    return factory
+
+
+def refill_sparkles(renderer, bursts):
+    sparkles = renderer.sparkles
+    sparkles.clear()
+    for i in range(bursts):
+        sparkles.emit(50 + (i * 37) % (WIDTH - 100), 50 + (i * 53) % (PLAY_AREA_HEIGHT - 100), (255, 215, 0))
+
+
+# name -> (scenarios it runs in, function(state, renderer) returning the callable to time)
+BENCHMARKS = {
+    "draw_gradient_background": (("birds_6",), lambda state, renderer: (
+        lambda: renderer.draw_gradient_background(state.remaining_time, state.config.game_duration))),
+    "draw_birds": (BIRD_SCENARIOS, lambda state, renderer: (
+        lambda: renderer.draw_birds(state.birds))),
+    "draw_player_circle": (("birds_6",), lambda state, renderer: (
+        lambda: renderer.draw_player(state.player_x, state.player_y, 0))),
+    "draw_player_cat": (("birds_6",), lambda state, renderer: (
+        lambda: renderer.draw_player(state.player_x, state.player_y, 1))),
+    "draw_player_hawk": (("birds_6",), lambda state, renderer: (
+        lambda: renderer.draw_player(state.player_x, state.player_y, 2))),
+    "draw_player_phoenix": (("birds_6",), lambda state, renderer: (
+        lambda: renderer.draw_player(state.player_x, state.player_y, 3))),
+    "sparkles_update_draw": (("sparkle_burst",), lambda state, renderer: (
+        lambda: (refill_sparkles(renderer, 500) if len(renderer.sparkles) < 2000 else None,
+                 renderer.sparkles.update(), renderer.draw_sparkles()))),
+    "draw_trail": (("phoenix_trail",), lambda state, renderer: (
+        lambda: renderer.draw_trail(state.trail))),
+    "bird_collisions": (BIRD_SCENARIOS, lambda state, renderer: state.bird_hits),
+    "power_up_collisions": (("birds_6",), lambda state, renderer: state.power_up_hits),
+    "update_birds": (BIRD_SCENARIOS, lambda state, renderer: state._update_birds),
+    "snapshot": (BIRD_SCENARIOS, lambda state, renderer: (lambda: snapshot(state))),
+    "restore": (BIRD_SCENARIOS, lambda state, renderer: (
+        lambda data=snapshot(state): restore(state, data))),
+    "draw_hud": (("birds_6",), lambda state, renderer: (lambda: renderer.draw_hud(state))),
+    "full_frame": (BIRD_SCENARIOS + ("sparkle_burst", "phoenix_trail"), lambda state, renderer: (
+        lambda: (renderer.tick(state.step()), renderer.draw(state)))),
+    **{f"full_frame_{level.name}": (("phoenix_burst",), quality_frame(level)) for level in QUALITY_LEVELS},
+}
+
+
+def measure(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Allocation profile in a separate pass so tracing doesn't skew timings
+    tracemalloc.start()
+    before_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.reset_peak()
+    alloc_iterations = max(1, iterations // 10)
+    for _ in range(alloc_iterations):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'mean_ms': statistics.fmean(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        'min_ms': samples[0],
+        'peak_alloc_bytes': peak,
+        'retained_blocks_per_call': (after_blocks - before_blocks) / alloc_iterations,
+    }
+
+
+def run(selected=None, scenarios=None, iterations=200, warmup=20):
+    pygame.init()
+    results = []
+    for name, (applies_to, factory) in BENCHMARKS.items():
+        if selected and name not in selected:
+            continue
+        for scenario in applies_to:
+            if scenarios and scenario not in scenarios:
+                continue
+            state, renderer = make_scene(scenario)
+            if 'sparkle_bursts' in SCENARIOS[scenario]:
+                refill_sparkles(renderer, SCENARIOS[scenario]['sparkle_bursts'])
+            n = max(5, iterations // 20) if scenario == "birds_60k" else iterations
+            stats = measure(factory(state, renderer), n, warmup)
+            results.append({'benchmark': name, 'scenario': scenario, **stats})
+            print(f"{name:<26} {scenario:<14} median {stats['median_ms']:8.3f} ms  "
+                  f"p95 {stats['p95_ms']:8.3f} ms  peak alloc {stats['peak_alloc_bytes']:>9} B",
+                  file=sys.stderr)
+    pygame.quit()
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+# Benchmarks whose median got slower than the baseline by more than threshold
+def regressions(report, baseline, threshold):
+    previous = {(r['benchmark'], r['scenario']): r for r in baseline['results']}
+    found = []
+    for result in report['results']:
+        old = previous.get((result['benchmark'], result['scenario']))
+        if old and old['median_ms'] > 0:
+            change = result['median_ms'] / old['median_ms'] - 1
+            if change > threshold:
+                found.append((result['benchmark'], result['scenario'], old['median_ms'], result['median_ms'], change))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", help="write results as JSON to this path (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if slower than this earlier JSON report")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed median slowdown, as a fraction")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS), help="only run these")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="only run these")
+    args = parser.parse_args(argv)
+
+    report = run(args.benchmark, args.scenario, args.iterations)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        found = regressions(report, baseline, args.threshold)
+        for name, scenario, old, new, change in found:
+            print(f"REGRESSION {name} [{scenario}]: {old:.3f} ms -> {new:.3f} ms (+{change:.0%})", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
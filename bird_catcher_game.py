@@ -1,587 +1,381 @@
-import pygame
+"""Bird Catcher: catch birds to evolve from a blob into a phoenix.
+
+Run from the repository root:
+
+    python bird_catcher_game.py
+    python bird_catcher_game.py --birds 20 --duration 90 --seed 7 --size 1050x1200
+    python bird_catcher_game.py --headless --bot greedy --seed 7
+    python bird_catcher_game.py --world 4000x3000 --birds 40
+
+Importing this module has no side effects. Pygame is imported when a run
+first needs it, and only the subsystems that run uses (display, font,
+mixer) are started. A headless game without video is pure simulation and
+never loads pygame at all.
+"""
+import argparse
+import logging
+import sqlite3
 import sys
-import random
-import math
-import os
-from pygame import mixer
-
-# Initialize Pygame
-pygame.init()
-mixer.init()
-
-# Set up the display
-WIDTH = 700
-HEIGHT = 800
-PLAY_AREA_HEIGHT = 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Bird Catcher Game")
-
-# Colors
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-RED = (255, 0, 0)
-BIRD_COLORS = [
-    (255, 0, 0),    # Red
-    (0, 255, 0),    # Green
-    (0, 0, 255),    # Blue
-    (255, 255, 0),  # Yellow
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-]
-
-# Player properties
-player_radius = 30
-player_x = WIDTH // 2
-player_y = PLAY_AREA_HEIGHT // 2
-player_speed = 5
-player_evolution = 0  # 0: circle, 1: cat, 2: hawk, 3: phoenix
-
-# Trail properties
-trail = []
-max_trail_length = 20
-
-# Bird properties
-bird_width = 40
-bird_height = 30
-num_birds = 6
-bird_animation_frames = 2
-bird_animation_speed = 10
-
-# Sparkle properties
-sparkles = []
-sparkle_duration = 30  # frames
-
-# Power-up properties
-power_ups = []
-power_up_active = None
-power_up_end_time = 0
-
-# Game state
-score = 0
-game_over = False
-victory = False
-font = pygame.font.SysFont(None, 36)
-
-# Timer
-game_duration = 60  # seconds
-start_time = pygame.time.get_ticks()
-
-# Create birds at random positions
-birds = []
-for i in range(num_birds):
-    x = random.randint(50, WIDTH - 50)
-    y = random.randint(50, PLAY_AREA_HEIGHT - 50)
-    color = BIRD_COLORS[i % len(BIRD_COLORS)]
-    direction = random.choice([-1, 1])
-    birds.append({
-        'x': x,
-        'y': y,
-        'color': color,
-        'captured': False,
-        'frame': 0,
-        'frame_counter': 0,
-        'direction': direction,
-        'offset': 0,
-        'offset_direction': random.choice([-1, 1])
-    })
-
-# Sound effects
-try:
-    # Create sounds directory if it doesn't exist
-    os.makedirs(os.path.join(os.getcwd(), "sounds"), exist_ok=True)
-    
-    # Load sound files if they exist, otherwise create placeholders
-    sound_files = {
-        "capture": "capture.wav",
-        "evolve": "evolve.wav",
-        "victory": "victory.wav",
-        "game_over": "game_over.wav",
-        "power_up": "power_up.wav",
-        "background": "background.wav"
-    }
-    
-    sounds = {}
-    for name, file in sound_files.items():
-        path = os.path.join("sounds", file)
-        if os.path.exists(path):
-            sounds[name] = mixer.Sound(path)
+import time
+
+from bots import BOTS
+from game_state import FPS, FRAME_MS, PLAY_AREA_HEIGHT, WIDTH, GameConfig, GameState, Inputs
+from profiler import FrameProfiler
+from quality import QUALITY_NAMES, QualityController
+from replay import InputRecorder
+from scores import DEFAULT_PATH as SCORES_PATH, ScoreEntry, ScoreStore
+
+log = logging.getLogger(__name__)
+
+# The simulation always advances in fixed ticks of FRAME_MS, however fast
+# frames are drawn. When a frame runs over budget the next one runs the
+# ticks it owes before drawing once, so slow hardware skips rendering, not
+# gameplay. Past this many ticks per frame the game slows down instead of
+# trying to catch up forever
+MAX_TICKS_PER_FRAME = 5
+
+# High scores listed on the game-over screen
+HIGH_SCORES_SHOWN = 3
+
+
+def parse_size(text):
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}") from None
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive, got {text!r}")
+    return width, height
+
+
+def parse_count(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {text!r}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"can't be negative, got {text!r}")
+    return value
+
+
+def parse_positive(text):
+    value = parse_count(text)
+    if value == 0:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {text!r}")
+    return value
+
+
+# Seeds also seed NumPy and go into unsigned 64-bit fields in recordings and
+# snapshots; this is the same range GameState draws random seeds from
+def parse_seed(text):
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer seed, got {text!r}") from None
+    if not 0 <= seed < 2 ** 63:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and 2**63 - 1, got {text!r}")
+    return seed
+
+
+def parse_world(text):
+    width, height = parse_size(text)
+    if width < WIDTH or height < PLAY_AREA_HEIGHT:
+        raise argparse.ArgumentTypeError(f"the world can't be smaller than the {WIDTH}x{PLAY_AREA_HEIGHT} view, "
+                                         f"got {text!r}")
+    return width, height
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=parse_size,
+                        help="window size as WIDTHxHEIGHT; the game is drawn at its native size "
+                             "and scaled to fit (default: native size)")
+    parser.add_argument("--birds", type=parse_count, default=GameConfig.num_birds)
+    parser.add_argument("--duration", type=parse_positive, default=GameConfig.game_duration, help="game length, seconds")
+    parser.add_argument("--world", type=parse_world,
+                        help="world size as WIDTHxHEIGHT; a world bigger than the view scrolls with the "
+                             "player, and --birds becomes the number of captures needed to win")
+    parser.add_argument("--birds-per-chunk", type=parse_count, default=GameConfig.birds_per_chunk,
+                        help="birds spawned in each 400-pixel chunk of a scrolling world")
+    parser.add_argument("--seed", type=parse_seed, help="fixed seed for a reproducible game (default: random)")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window or sound: a bot plays one game as fast as possible")
+    parser.add_argument("--bot", choices=BOTS, default="greedy", help="who plays a headless game")
+    parser.add_argument("--quality", choices=["auto", *QUALITY_NAMES], default="auto",
+                        help="render detail; auto lowers it while frames run over budget and "
+                             "raises it again once there is headroom")
+    parser.add_argument("--mute", action="store_true", help="don't start the audio mixer")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="push only the changed regions to the display instead of flipping the "
+                             "whole window; worth it where fill rate is the bottleneck")
+    parser.add_argument("--record", metavar="PATH", help="save the inputs of this session for replay.py")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="collect frame timings from the start and dump them to this .csv or "
+                             ".json file on exit (F3 toggles the overlay either way)")
+    parser.add_argument("--video", metavar="PATH",
+                        help="record gameplay video: a .rgb file for raw memory-mapped video, or a "
+                             "directory for a PNG sequence. In a window, frames are dropped rather "
+                             "than slowing the game down")
+    parser.add_argument("--rewind", type=parse_count, default=10, metavar="SECONDS",
+                        help="hold Backspace to rewind up to this much play; 0 disables it. Not "
+                             "available while recording inputs, since a replay can't go backwards")
+    parser.add_argument("--scores", metavar="PATH",
+                        help=f"high-score database (default: {SCORES_PATH}); headless and --frames runs "
+                             "only save scores when this is given")
+    parser.add_argument("--no-scores", action="store_true", help="don't save or show high scores")
+    parser.add_argument("--frames", type=parse_positive, metavar="N", help="quit after N frames (smoke tests, startup timing)")
+    return parser.parse_args(argv)
+
+
+# Read the keyboard into simulation inputs
+def read_inputs():
+    import pygame
+
+    keys = pygame.key.get_pressed()
+    return Inputs(
+        left=keys[pygame.K_LEFT],
+        right=keys[pygame.K_RIGHT],
+        up=keys[pygame.K_UP],
+        down=keys[pygame.K_DOWN],
+        restart=keys[pygame.K_r],
+    )
+
+
+def game_ended(events):
+    return any(name in ("victory", "game_over") for name, _ in events)
+
+
+# Queue the final score when a game ends
+def record_score(scores, state, events, player="you"):
+    if game_ended(events):
+        scores.add(ScoreEntry.from_state(state, player))
+
+
+# The high-score table for this run, or None to play without one
+def open_scores(args):
+    if args.no_scores:
+        return None
+    path = args.scores
+    if path is None:
+        # Bot games and smoke tests stay off the player's own table
+        if args.headless or args.frames:
+            return None
+        path = SCORES_PATH
+    try:
+        return ScoreStore(path)
+    except sqlite3.Error as exc:
+        log.warning("playing without high scores: can't open %s: %s", path, exc)
+        return None
+
+
+def run_window(state, args, recorder, profiler, scores):
+    import pygame
+    from renderer import HEIGHT, Renderer
+    from screen_recorder import ScreenRecorder
+    from snapshot import SnapshotRing
+
+    pygame.display.init()
+    native = (WIDTH, HEIGHT)
+    window = pygame.display.set_mode(args.size or native)
+    pygame.display.set_caption("Bird Catcher Game")
+
+    # At any other window size, draw offscreen and scale the whole frame up
+    scaled = window.get_size() != native
+    screen = pygame.Surface(native) if scaled else window
+
+    # The default font is bundled with pygame; SysFont would scan the
+    # system's fonts first only to fall back to it
+    pygame.font.init()
+    renderer = Renderer(screen, pygame.font.Font(None, 36), dirty_rects=args.dirty_rects and not scaled,
+                        seed=state.seed)
+    renderer.profiler = profiler
+
+    # Render quality: fixed, or stepped to keep frames within budget
+    controller = None
+    if args.quality == "auto":
+        controller = QualityController()
+    else:
+        renderer.set_quality(QUALITY_NAMES[args.quality])
+
+    # Sound effects: decoded in the background, synthesized in memory when
+    # there are no asset files
+    audio = None
+    if not args.mute:
+        from audio import AudioManager
+
+        audio = AudioManager()
+        audio.preload_async(loop="background")
+
+    video = ScreenRecorder(args.video, screen.get_size()) if args.video else None
+    history = SnapshotRing(args.rewind * FPS) if args.rewind > 0 and recorder is None else None
+    if history is not None:
+        history.push(state)
+
+    clock = pygame.time.Clock()
+    running = True
+    lag = 0.0
+    drawn = 0
+
+    try:
+        while running:
+            # Cap the frame rate, and bank the real time that passed for the simulation
+            lag = min(lag + clock.tick(FPS), MAX_TICKS_PER_FRAME * FRAME_MS)
+            frame_start = time.perf_counter()
+            profiler.begin_frame()
+
+            # Handle events
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+            profiler.lap("events")
+
+            # Advance the simulation by every tick that is due
+            inputs = read_inputs()
+            rewinding = history is not None and pygame.key.get_pressed()[pygame.K_BACKSPACE]
+            ticks = 0
+            while lag >= FRAME_MS:
+                lag -= FRAME_MS
+                ticks += 1
+                if rewinding:
+                    history.rewind(state)
+                    profiler.lap("update")
+                    renderer.tick([])
+                    profiler.lap("sparkles")
+                    continue
+                if recorder:
+                    recorder.record(inputs)
+                events = state.step(inputs)
+                if recorder:
+                    recorder.after_step()
+                if history is not None:
+                    # A finished game is final: rewinding stops at its end,
+                    # so the same game can't end, and score, twice
+                    if game_ended(events):
+                        history.clear()
+                    history.push(state)
+                if scores:
+                    record_score(scores, state, events)
+                profiler.lap("update")
+                if audio:
+                    for name, _ in events:
+                        audio.play(name)
+                    profiler.lap("audio")
+                renderer.tick(events)
+                profiler.lap("sparkles")
+
+            # Nothing changed since the last frame was drawn
+            if not ticks:
+                continue
+
+            # Draw everything; the store answers from its cache until a new score lands
+            if scores and state.game_over:
+                renderer.high_scores = tuple(entry.score for entry in scores.top(HIGH_SCORES_SHOWN))
+            dirty = renderer.draw(state)
+
+            # Update the display
+            if scaled:
+                pygame.transform.smoothscale(screen, window.get_size(), window)
+                pygame.display.flip()
+            elif dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            if video:
+                video.capture(screen)
+            profiler.lap("flip")
+            profiler.end_frame()
+
+            # Judge quality by the work a frame took, not the wait for the next one
+            if controller and controller.update((time.perf_counter() - frame_start) * 1000):
+                renderer.set_quality(controller.level)
+
+            drawn += 1
+            if args.frames and drawn >= args.frames:
+                running = False
+    finally:
+        if video:
+            video.close()
+        pygame.quit()
+
+
+def run_headless(state, args, recorder, profiler, scores):
+    player = BOTS[args.bot](state.seed)
+
+    # Frames are only drawn when they're being recorded
+    renderer = video = None
+    if args.video:
+        import pygame
+        from renderer import HEIGHT, Renderer
+        from screen_recorder import ScreenRecorder
+
+        pygame.font.init()
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        renderer = Renderer(screen, pygame.font.Font(None, 36), seed=state.seed)
+        renderer.profiler = profiler
+        if args.quality != "auto":
+            renderer.set_quality(QUALITY_NAMES[args.quality])
+        video = ScreenRecorder(args.video, screen.get_size(), policy="block")
+
+    start = time.perf_counter()
+    try:
+        while not state.game_over and not (args.frames and state.frame >= args.frames):
+            profiler.begin_frame()
+            inputs = player(state)
+            if recorder:
+                recorder.record(inputs)
+            events = state.step(inputs)
+            if recorder:
+                recorder.after_step()
+            if scores:
+                record_score(scores, state, events, player=args.bot)
+            profiler.lap("update")
+            if renderer:
+                renderer.tick(events)
+                profiler.lap("sparkles")
+                renderer.draw(state)
+                video.capture(screen)
+            profiler.end_frame()
+    finally:
+        if video:
+            video.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"seed {state.seed}: {state.frame} frames in {elapsed:.3f}s")
+    print(f"final score {state.score}, form {state.player_evolution}, "
+          f"{'victory' if state.victory else 'no victory'}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    world_width, world_height = args.world or (WIDTH, PLAY_AREA_HEIGHT)
+    config = GameConfig(num_birds=args.birds, game_duration=args.duration, world_width=world_width,
+                        world_height=world_height, birds_per_chunk=args.birds_per_chunk)
+    state = GameState(config, seed=args.seed)
+    recorder = InputRecorder(state, hash_interval=60) if args.record else None
+    profiler = FrameProfiler(enabled=args.profile is not None)
+    state.profiler = profiler
+    scores = open_scores(args)
+
+    try:
+        if args.headless:
+            run_headless(state, args, recorder, profiler, scores)
         else:
-            # Create a placeholder sound file
-            with open(path, "wb") as f:
-                # Write a minimal WAV file header
-                f.write(b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00\x44\xAC\x00\x00\x88\x58\x01\x00\x02\x00\x10\x00data\x00\x00\x00\x00")
-            sounds[name] = mixer.Sound(path)
-    
-    # Start background music
-    sounds["background"].play(-1)  # Loop indefinitely
-    sound_loaded = True
-except:
-    sound_loaded = False
-    sounds = {}
-
-# Function to create gradient background
-def draw_gradient_background():
-    # Create a gradient from dark blue to purple
-    time_factor = max(0, min(1, remaining_time / game_duration))
-    
-    for y in range(PLAY_AREA_HEIGHT):
-        # Calculate color based on position and time
-        r = int(20 + (y / PLAY_AREA_HEIGHT) * 40)
-        g = int(10 + (y / PLAY_AREA_HEIGHT) * 20)
-        b = int(50 + (y / PLAY_AREA_HEIGHT) * 100)
-        
-        # Make colors more intense as time runs out
-        if time_factor < 0.3:
-            r = min(255, int(r * (1.5 - time_factor)))
-        
-        # Draw a line with the calculated color
-        pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-
-# Function to create sparkle effect
-def create_sparkles(x, y, color):
-    for _ in range(20):
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(1, 5)
-        size = random.randint(2, 5)
-        lifetime = random.randint(10, sparkle_duration)
-        sparkles.append({
-            'x': x,
-            'y': y,
-            'dx': math.cos(angle) * speed,
-            'dy': math.sin(angle) * speed,
-            'size': size,
-            'color': color,
-            'lifetime': lifetime
-        })
-
-# Function to draw a bird
-def draw_bird(bird):
-    x, y = bird['x'], bird['y']
-    color = bird['color']
-    frame = bird['frame']
-    direction = bird['direction']
-    
-    # Bird body
-    pygame.draw.ellipse(screen, color, (x - bird_width//2, y - bird_height//2, bird_width, bird_height))
-    
-    # Bird head
-    head_radius = bird_height // 3
-    head_x = x + direction * (bird_width//2 - head_radius//2)
-    pygame.draw.circle(screen, color, (head_x, y - bird_height//6), head_radius)
-    
-    # Bird eye
-    eye_x = head_x + direction * (head_radius//2)
-    pygame.draw.circle(screen, BLACK, (eye_x, y - bird_height//4), 3)
-    
-    # Bird wings (animated)
-    wing_y = y + (5 if frame == 0 else -5)
-    wing_points = [
-        (x, y),
-        (x - direction * (bird_width//4), wing_y - bird_height//2),
-        (x + direction * (bird_width//4), wing_y - bird_height//2)
-    ]
-    pygame.draw.polygon(screen, color, wing_points)
-
-# Function to draw the player based on evolution level
-def draw_player(x, y, evolution):
-    if evolution == 0:  # Circle (default)
-        pygame.draw.circle(screen, RED, (x, y), player_radius)
-    
-    elif evolution == 1:  # Cat
-        # Cat body (circle)
-        pygame.draw.circle(screen, (200, 100, 100), (x, y), player_radius)
-        
-        # Cat ears
-        pygame.draw.polygon(screen, (200, 100, 100), [
-            (x - player_radius//2, y - player_radius),
-            (x - player_radius, y - player_radius*1.5),
-            (x, y - player_radius)
-        ])
-        pygame.draw.polygon(screen, (200, 100, 100), [
-            (x + player_radius//2, y - player_radius),
-            (x + player_radius, y - player_radius*1.5),
-            (x, y - player_radius)
-        ])
-        
-        # Cat eyes
-        pygame.draw.circle(screen, BLACK, (x - player_radius//2, y - player_radius//4), 4)
-        pygame.draw.circle(screen, BLACK, (x + player_radius//2, y - player_radius//4), 4)
-        
-        # Cat mouth
-        pygame.draw.line(screen, BLACK, (x - player_radius//3, y + player_radius//3), 
-                        (x + player_radius//3, y + player_radius//3), 2)
-    
-    elif evolution == 2:  # Hawk
-        # Hawk body
-        pygame.draw.circle(screen, (139, 69, 19), (x, y), player_radius)
-        
-        # Hawk wings
-        pygame.draw.polygon(screen, (120, 60, 10), [
-            (x, y),
-            (x - player_radius*1.5, y),
-            (x - player_radius, y - player_radius//2)
-        ])
-        pygame.draw.polygon(screen, (120, 60, 10), [
-            (x, y),
-            (x + player_radius*1.5, y),
-            (x + player_radius, y - player_radius//2)
-        ])
-        
-        # Hawk beak
-        pygame.draw.polygon(screen, (255, 200, 0), [
-            (x, y),
-            (x - player_radius//3, y + player_radius//3),
-            (x + player_radius//3, y + player_radius//3)
-        ])
-        
-        # Hawk eyes
-        pygame.draw.circle(screen, BLACK, (x - player_radius//3, y - player_radius//4), 3)
-        pygame.draw.circle(screen, BLACK, (x + player_radius//3, y - player_radius//4), 3)
-    
-    elif evolution == 3:  # Phoenix
-        # Phoenix body
-        pygame.draw.circle(screen, (255, 100, 0), (x, y), player_radius)
-        
-        # Phoenix flame aura
-        for i in range(12):
-            angle = i * (2 * math.pi / 12)
-            end_x = x + math.cos(angle) * (player_radius * 1.5)
-            end_y = y + math.sin(angle) * (player_radius * 1.5)
-            mid_x = x + math.cos(angle) * (player_radius * 1.2)
-            mid_y = y + math.sin(angle) * (player_radius * 1.2)
-            
-            # Draw flame
-            pygame.draw.polygon(screen, (255, 200, 0), [
-                (x, y),
-                (mid_x + random.randint(-5, 5), mid_y + random.randint(-5, 5)),
-                (end_x, end_y)
-            ])
-        
-        # Phoenix eyes
-        pygame.draw.circle(screen, (255, 255, 255), (x - player_radius//3, y - player_radius//4), 4)
-        pygame.draw.circle(screen, (255, 255, 255), (x + player_radius//3, y - player_radius//4), 4)
-        pygame.draw.circle(screen, (0, 0, 0), (x - player_radius//3, y - player_radius//4), 2)
-        pygame.draw.circle(screen, (0, 0, 0), (x + player_radius//3, y - player_radius//4), 2)
-
-# Function to spawn power-up
-def spawn_power_up():
-    if random.random() < 0.005 and not power_ups and not power_up_active:  # 0.5% chance per frame
-        x = random.randint(50, WIDTH - 50)
-        y = random.randint(50, PLAY_AREA_HEIGHT - 50)
-        power_ups.append({
-            'type': "speed" if random.random() < 0.5 else "invincibility",
-            'x': x,
-            'y': y,
-            'radius': 15,
-            'color': (255, 215, 0)  # Gold color
-        })
-
-# Game loop
-clock = pygame.time.Clock()
-running = True
-sound_played = False
-
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-    
-    # Calculate remaining time
-    elapsed_time = (pygame.time.get_ticks() - start_time) // 1000
-    remaining_time = max(0, game_duration - elapsed_time)
-    
-    if not game_over and remaining_time > 0:
-        # Check if power-up is active
-        if power_up_active:
-            if pygame.time.get_ticks() > power_up_end_time:
-                # Power-up expired
-                if power_up_active == "speed":
-                    player_speed = 5 + player_evolution
-                power_up_active = None
-        
-        # Handle key presses for movement
-        keys = pygame.key.get_pressed()
-        current_speed = player_speed
-        
-        if keys[pygame.K_LEFT] and player_x - current_speed > player_radius:
-            player_x -= current_speed
-        if keys[pygame.K_RIGHT] and player_x + current_speed < WIDTH - player_radius:
-            player_x += current_speed
-        if keys[pygame.K_UP] and player_y - current_speed > player_radius:
-            player_y -= current_speed
-        if keys[pygame.K_DOWN] and player_y + current_speed < PLAY_AREA_HEIGHT - player_radius:
-            player_y += current_speed
-        
-        # Add current position to trail
-        if player_evolution == 3:  # Phoenix leaves flame trail
-            trail.append((player_x, player_y))
-            if len(trail) > max_trail_length:
-                trail.pop(0)
-        
-        # Update bird animations and positions
-        for bird in birds:
-            if not bird['captured']:
-                # Update animation frame
-                bird['frame_counter'] += 1
-                if bird['frame_counter'] >= bird_animation_speed:
-                    bird['frame'] = (bird['frame'] + 1) % bird_animation_frames
-                    bird['frame_counter'] = 0
-                
-                # Move bird side to side
-                bird['offset'] += 0.5 * bird['offset_direction']
-                if abs(bird['offset']) > 20:
-                    bird['offset_direction'] *= -1
-                
-                # Update bird position
-                bird['x'] += bird['offset_direction'] * 0.5
-                
-                # Keep birds within bounds
-                if bird['x'] < 50:
-                    bird['x'] = 50
-                    bird['offset_direction'] *= -1
-                elif bird['x'] > WIDTH - 50:
-                    bird['x'] = WIDTH - 50
-                    bird['offset_direction'] *= -1
-        
-        # Update and check for power-up collisions
-        for power_up in power_ups[:]:
-            # Check if player collects power-up
-            distance = ((player_x - power_up['x']) ** 2 + (player_y - power_up['y']) ** 2) ** 0.5
-            if distance < player_radius + power_up['radius']:
-                power_ups.remove(power_up)
-                power_up_active = power_up['type']
-                power_up_end_time = pygame.time.get_ticks() + 5000  # 5 seconds
-                
-                if power_up['type'] == "speed":
-                    player_speed *= 2
-                
-                if sound_loaded:
-                    try:
-                        sounds["power_up"].play()
-                    except:
-                        pass
-        
-        # Check for bird captures
-        for bird in birds:
-            if not bird['captured']:
-                # Check if player overlaps with bird
-                distance = ((player_x - bird['x']) ** 2 + (player_y - bird['y']) ** 2) ** 0.5
-                
-                if distance < player_radius + bird_width // 2:
-                    bird['captured'] = True
-                    score += 50
-                    create_sparkles(bird['x'], bird['y'], bird['color'])
-                    
-                    # Check for evolution
-                    birds_captured = sum(1 for b in birds if b['captured'])
-                    
-                    if birds_captured == 2 and player_evolution < 1:
-                        player_evolution = 1  # Evolve to cat
-                        player_speed = 6  # Slightly faster
-                        if sound_loaded:
-                            try:
-                                sounds["evolve"].play()
-                            except:
-                                pass
-                    
-                    elif birds_captured == 4 and player_evolution < 2:
-                        player_evolution = 2  # Evolve to hawk
-                        player_speed = 7
-                        if sound_loaded:
-                            try:
-                                sounds["evolve"].play()
-                            except:
-                                pass
-                    
-                    elif birds_captured == 6 and player_evolution < 3:
-                        player_evolution = 3  # Evolve to phoenix
-                        player_speed = 8
-                        if sound_loaded:
-                            try:
-                                sounds["evolve"].play()
-                            except:
-                                pass
-                    
-                    if sound_loaded:
-                        try:
-                            sounds["capture"].play()
-                        except:
-                            pass
-        
-        # Check if all birds are captured
-        if all(bird['captured'] for bird in birds):
-            game_over = True
-            victory = True
-            
-            if sound_loaded and not sound_played:
-                try:
-                    sounds["victory"].play()
-                    sound_played = True
-                except:
-                    pass
-        
-        # Spawn power-ups
-        spawn_power_up()
-    
-    # Check if time is up
-    if remaining_time <= 0 and not game_over:
-        game_over = True
-        victory = False
-        
-        if sound_loaded and not sound_played:
+            run_window(state, args, recorder, profiler, scores)
+    finally:
+        if scores:
+            # Whatever stopped the writer, still save the recording and profile
             try:
-                sounds["game_over"].play()
-                sound_played = True
-            except:
-                pass
-    
-    # Draw gradient background
-    draw_gradient_background()
-    
-    # Draw trail for phoenix
-    for i, (trail_x, trail_y) in enumerate(trail):
-        # Make trail fade out
-        alpha = int(255 * (i / max_trail_length))
-        radius = int(player_radius * 0.7 * (i / max_trail_length))
-        
-        # Draw flame trail with transparency
-        s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 100, 0, alpha), (radius, radius), radius)
-        screen.blit(s, (trail_x - radius, trail_y - radius))
-    
-    # Update and draw sparkles
-    for sparkle in sparkles[:]:
-        sparkle['x'] += sparkle['dx']
-        sparkle['y'] += sparkle['dy']
-        sparkle['lifetime'] -= 1
-        
-        if sparkle['lifetime'] <= 0:
-            sparkles.remove(sparkle)
-        else:
-            # Draw sparkle with fading effect
-            alpha = int(255 * (sparkle['lifetime'] / sparkle_duration))
-            sparkle_color = sparkle['color'] + (alpha,)
-            s = pygame.Surface((sparkle['size'] * 2, sparkle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, sparkle_color, (sparkle['size'], sparkle['size']), sparkle['size'])
-            screen.blit(s, (sparkle['x'] - sparkle['size'], sparkle['y'] - sparkle['size']))
-    
-    # Draw the birds
-    for bird in birds:
-        if not bird['captured']:
-            draw_bird(bird)
-    
-    # Draw power-ups
-    for power_up in power_ups:
-        pygame.draw.circle(screen, power_up['color'], (power_up['x'], power_up['y']), power_up['radius'])
-        
-        # Draw icon based on power-up type
-        if power_up['type'] == "speed":
-            # Draw lightning bolt
-            pygame.draw.line(screen, BLACK, (power_up['x'] - 5, power_up['y'] - 5), 
-                            (power_up['x'] + 5, power_up['y'] + 5), 2)
-            pygame.draw.line(screen, BLACK, (power_up['x'] + 5, power_up['y'] - 5), 
-                            (power_up['x'] - 5, power_up['y'] + 5), 2)
-        elif power_up['type'] == "invincibility":
-            # Draw shield shape
-            pygame.draw.circle(screen, BLACK, (power_up['x'], power_up['y']), 7, 2)
-    
-    # Draw the player
-    draw_player(player_x, player_y, player_evolution)
-    
-    # Draw UI background at bottom
-    pygame.draw.rect(screen, (50, 50, 50), (0, PLAY_AREA_HEIGHT, WIDTH, HEIGHT - PLAY_AREA_HEIGHT))
-    
-    # Draw score
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    screen.blit(score_text, (20, PLAY_AREA_HEIGHT + 30))
-    
-    # Draw timer
-    timer_text = font.render(f"Time: {remaining_time}s", True, WHITE)
-    screen.blit(timer_text, (WIDTH - 150, PLAY_AREA_HEIGHT + 30))
-    
-    # Draw evolution status
-    evolution_names = ["Circle", "Cat", "Hawk", "Phoenix"]
-    evolution_text = font.render(f"Form: {evolution_names[player_evolution]}", True, WHITE)
-    screen.blit(evolution_text, (WIDTH // 2 - 70, PLAY_AREA_HEIGHT + 30))
-    
-    # Draw active power-up
-    if power_up_active:
-        power_up_text = font.render(f"Power-up: {power_up_active.capitalize()}", True, (255, 215, 0))
-        screen.blit(power_up_text, (20, PLAY_AREA_HEIGHT + 70))
-    
-    # Draw game over message
-    if game_over:
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, (0, 0))
-        
-        if victory:
-            message = "Victory! All birds captured!"
-        else:
-            message = "Game Over! Time's up!"
-        
-        # Draw main message
-        game_over_text = font.render(message, True, WHITE)
-        text_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
-        screen.blit(game_over_text, text_rect)
-        
-        # Draw final score
-        final_score_text = font.render(f"Final Score: {score}", True, WHITE)
-        final_score_rect = final_score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 30))
-        screen.blit(final_score_text, final_score_rect)
-        
-        # Draw restart instruction
-        restart_text = font.render("Press R to restart", True, WHITE)
-        restart_rect = restart_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 80))
-        screen.blit(restart_text, restart_rect)
-        
-        # Check for restart
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
-            # Reset game
-            player_evolution = 0
-            player_speed = 5
-            player_x = WIDTH // 2
-            player_y = PLAY_AREA_HEIGHT // 2
-            score = 0
-            game_over = False
-            victory = False
-            sound_played = False
-            trail = []
-            sparkles = []
-            power_ups = []
-            power_up_active = None
-            
-            # Reset birds
-            birds = []
-            for i in range(num_birds):
-                x = random.randint(50, WIDTH - 50)
-                y = random.randint(50, PLAY_AREA_HEIGHT - 50)
-                color = BIRD_COLORS[i % len(BIRD_COLORS)]
-                direction = random.choice([-1, 1])
-                birds.append({
-                    'x': x,
-                    'y': y,
-                    'color': color,
-                    'captured': False,
-                    'frame': 0,
-                    'frame_counter': 0,
-                    'direction': direction,
-                    'offset': 0,
-                    'offset_direction': random.choice([-1, 1])
-                })
-            
-            # Reset timer
-            start_time = pygame.time.get_ticks()
-    
-    # Update the display
-    pygame.display.flip()
-    
-    # Cap the frame rate
-    clock.tick(60)
-
-# Quit Pygame
-pygame.quit()
-sys.exit()
\ No newline at end of file
+                scores.close()
+            except Exception as exc:
+                log.error("the latest high scores weren't saved: %s", exc)
+        if recorder:
+            recorder.save(args.record)
+        if args.profile:
+            profiler.dump(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
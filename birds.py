@@ -0,0 +1,97 @@
+import numpy as np
+
+# Bird properties
+bird_width = 40
+bird_height = 30
+bird_animation_frames = 2
+bird_animation_speed = 10
+
+# Side-to-side drift
+bird_drift_speed = 0.5
+bird_max_offset = 20
+bird_margin = 50  # birds stay this far from the play-area edges
+
+
+class Flock:
+    """Every bird's state as parallel NumPy arrays, indexed by bird number.
+
+    ``color`` holds an index into ``BIRD_COLORS``; ``captured`` doubles as
+    the mask of birds that no longer animate, move or collide.
+    """
+
+    # Every per-bird array, for copying whole rows between flocks
+    FIELDS = ("x", "y", "color", "captured", "frame", "frame_counter", "direction", "offset", "offset_direction")
+
+    def __init__(self, n):
+        self.x = np.zeros(n, dtype=np.float64)
+        self.y = np.zeros(n, dtype=np.float64)
+        self.color = np.zeros(n, dtype=np.int16)
+        self.captured = np.zeros(n, dtype=bool)
+        self.frame = np.zeros(n, dtype=np.int8)
+        self.frame_counter = np.zeros(n, dtype=np.int16)
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.offset = np.zeros(n, dtype=np.float64)
+        self.offset_direction = np.zeros(n, dtype=np.int8)
+
+    # Create birds at random positions in one batch
+    @classmethod
+    def spawn(cls, n, rng, width, height, num_colors):
+        flock = cls(n)
+        flock.x[:] = rng.integers(bird_margin, width - bird_margin + 1, n)
+        flock.y[:] = rng.integers(bird_margin, height - bird_margin + 1, n)
+        flock.color[:] = np.arange(n) % num_colors
+        flock.direction[:] = rng.choice((-1, 1), n)
+        flock.offset_direction[:] = rng.choice((-1, 1), n)
+        return flock
+
+    # Join flocks end to end into a new one
+    @classmethod
+    def concatenate(cls, flocks):
+        flock = cls(0)
+        for name in cls.FIELDS:
+            setattr(flock, name, np.concatenate([getattr(f, name) for f in flocks]))
+        return flock
+
+    # A new flock holding just the given rows
+    def take(self, indices):
+        flock = Flock(0)
+        for name in self.FIELDS:
+            setattr(flock, name, getattr(self, name)[indices])
+        return flock
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def alive(self):
+        return np.flatnonzero(~self.captured)
+
+    def update(self, width):
+        # Whole-array arithmetic masked by ``active`` is much cheaper than
+        # boolean fancy indexing once there are thousands of birds; the
+        # rarer branches are skipped entirely when no bird needs them, which
+        # one reduction over the whole array tells more cheaply than a mask
+        active = ~self.captured
+        step = active * bird_drift_speed
+
+        # Update animation frames
+        self.frame_counter += active
+        if self.frame_counter.max(initial=0) >= bird_animation_speed:
+            flap = self.frame_counter >= bird_animation_speed
+            np.copyto(self.frame, (self.frame + 1) % bird_animation_frames, where=flap)
+            self.frame_counter[flap] = 0
+
+        # Move birds side to side, turning around at the end of their swing
+        od = self.offset_direction
+        move = step * od
+        self.offset += move
+        swing = np.abs(self.offset)
+        if swing.max(initial=0) > bird_max_offset:
+            np.negative(od, out=od, where=(swing > bird_max_offset) & active)
+            move = step * od
+        self.x += move
+
+        # Keep birds within bounds
+        if self.x.min(initial=bird_margin) < bird_margin or self.x.max(initial=0) > width - bird_margin:
+            np.negative(od, out=od, where=(self.x < bird_margin) | (self.x > width - bird_margin))
+            np.clip(self.x, bird_margin, width - bird_margin, out=self.x)
@@ -0,0 +1,72 @@
+"""Scripted players that drive a ``GameState`` without a keyboard."""
+import numpy as np
+
+from game_state import Inputs, NO_INPUT
+
+# Stop steering along an axis once within this many pixels of the target
+DEADZONE = 3
+
+
+def steer_towards(state, tx, ty):
+    dx = tx - state.player_x
+    dy = ty - state.player_y
+    return Inputs(
+        left=dx < -DEADZONE,
+        right=dx > DEADZONE,
+        up=dy < -DEADZONE,
+        down=dy > DEADZONE,
+    )
+
+
+class GreedyBot:
+    """Chases the nearest uncaptured bird, detouring for close power-ups."""
+
+    def __call__(self, state):
+        if state.game_over:
+            return NO_INPUT
+
+        px, py = state.player_x, state.player_y
+        birds = state.birds
+        alive = birds.alive
+        if not len(alive):
+            return NO_INPUT
+
+        dx = birds.x[alive] - px
+        dy = birds.y[alive] - py
+        d2 = dx * dx + dy * dy
+        nearest = int(np.argmin(d2))
+        target = (birds.x[alive[nearest]], birds.y[alive[nearest]])
+
+        for power_up in state.power_ups:
+            pdx = power_up['x'] - px
+            pdy = power_up['y'] - py
+            if pdx * pdx + pdy * pdy < d2[nearest]:
+                target = (power_up['x'], power_up['y'])
+
+        return steer_towards(state, *target)
+
+
+class RandomBot:
+    """Holds a random direction for a random number of frames."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.inputs = NO_INPUT
+        self.hold = 0
+
+    def __call__(self, state):
+        if state.game_over:
+            return NO_INPUT
+        if self.hold <= 0:
+            keys = self.rng.random(4) < 0.5
+            self.inputs = Inputs(*keys.tolist())
+            self.hold = int(self.rng.integers(5, 60))
+        self.hold -= 1
+        return self.inputs
+
+
+# Bot factories by name, each taking the game's seed
+BOTS = {
+    "greedy": lambda seed: GreedyBot(),
+    "random": RandomBot,
+}
@@ -0,0 +1,300 @@
+"""Multiplayer client: prediction for your own chaser, interpolation for the rest.
+
+``MatchClient`` is the network side and runs headless (the load test
+drives dozens of them). Your own chaser moves the moment a key is pressed
+by replaying not-yet-acknowledged inputs on top of the server's latest
+position. Everything else is drawn ``interpolation_ticks`` behind the
+newest snapshot, blended between the two snapshots around that time, so
+it moves smoothly despite packet jitter.
+
+Run from the repository root with a server already up:
+
+    python client.py --host 127.0.0.1 --port 5757
+"""
+import argparse
+import collections
+import socket
+import sys
+import time
+
+import numpy as np
+
+import netcode
+from birds import Flock
+from game_state import FPS, POWER_UP_COLOR, GameConfig, Inputs, move_player, power_up_radius
+from replay import pack_inputs
+
+# How far behind the newest snapshot other players and birds are drawn
+INTERPOLATION_TICKS = 3
+
+# Decoded frames kept as delta baselines; must cover the server's view of our acks
+FRAME_HISTORY = 64
+
+
+class MatchClient:
+    """Connection to a ``MatchServer``, with decoded state ready to draw."""
+
+    def __init__(self, host="127.0.0.1", port=netcode.DEFAULT_PORT, interpolation_ticks=INTERPOLATION_TICKS):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.connect((host, port))
+        self.sock.setblocking(False)
+        self.interpolation_ticks = interpolation_ticks
+        self.player_id = None
+        self.config = None
+        self.frames = collections.OrderedDict()  # tick -> Frame
+        self.latest = None
+        self.render_tick = 0.0
+
+        # Prediction: inputs the server hasn't applied yet, and where they put us
+        self.seq = 0
+        self.pending = collections.deque()
+        self.predicted = None
+
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.corrections = 0  # predictions the server disagreed with
+
+    def join(self, timeout=5.0):
+        """Ask to join and wait for the server's WELCOME; False on timeout."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            self.sock.send(netcode.encode_join())
+            wait = time.perf_counter() + 0.2
+            while time.perf_counter() < wait:
+                self.poll()
+                if self.player_id is not None:
+                    return True
+                time.sleep(0.005)
+        return False
+
+    def close(self):
+        try:
+            self.sock.send(netcode.encode_leave())
+        except OSError:
+            pass
+        self.sock.close()
+
+    def send_input(self, inputs):
+        """Send this tick's input and move our own chaser right away."""
+        self.seq += 1
+        if self.predicted is not None:
+            self.pending.append((self.seq, inputs))
+            self.predicted = move_player(*self.predicted, self._speed(), inputs)
+        ack = self.latest.tick if self.latest is not None else netcode.NO_BASELINE
+        try:
+            self.sock.send(netcode.encode_input(self.seq, ack, pack_inputs(inputs)))
+        except (BlockingIOError, ConnectionRefusedError):
+            pass
+
+    def poll(self):
+        """Read every waiting packet; True if a newer snapshot arrived."""
+        updated = False
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, ConnectionRefusedError):
+                return updated
+            self.bytes_received += len(data)
+            kind = netcode.packet_kind(data)
+            if kind == netcode.WELCOME and self.player_id is None:
+                self.player_id, config = netcode.decode_welcome(data)
+                self.config = GameConfig(**{key: tuple(value) if isinstance(value, list) else value
+                                            for key, value in config.items()})
+            elif kind == netcode.SNAPSHOT:
+                decoded = netcode.decode_snapshot(data, self.frames)
+                if decoded is None:
+                    continue
+                frame, _, input_seq = decoded
+                self.snapshots += 1
+                self.frames[frame.tick] = frame
+                while len(self.frames) > FRAME_HISTORY:
+                    self.frames.popitem(last=False)
+                if self.latest is None or frame.tick > self.latest.tick:
+                    self.latest = frame
+                    self._reconcile(input_seq)
+                    updated = True
+
+    def _speed(self):
+        me = self.latest.players.get(self.player_id) if self.latest is not None else None
+        return me[5] if me else self.config.player_speeds[0]
+
+    # Start from the server's position and replay what it hasn't seen yet
+    def _reconcile(self, input_seq):
+        me = self.latest.players.get(self.player_id)
+        if me is None:
+            return
+        while self.pending and self.pending[0][0] <= input_seq:
+            self.pending.popleft()
+        x, y = me[0], me[1]
+        for _, inputs in self.pending:
+            x, y = move_player(x, y, me[5], inputs)
+        if self.predicted is not None and (x, y) != self.predicted:
+            self.corrections += 1
+        self.predicted = (x, y)
+
+    def advance(self):
+        """Move the interpolation clock on by one local tick."""
+        if self.latest is None:
+            return
+        target = self.latest.tick - self.interpolation_ticks
+        self.render_tick += 1
+        # Snap after stalls; otherwise drift gently towards the target delay
+        if abs(target - self.render_tick) > 2 * FPS // 10:
+            self.render_tick = float(target)
+        else:
+            self.render_tick += 0.1 * (target - self.render_tick)
+
+    def interpolated(self):
+        """``(frame, bird_x, others)`` for drawing at the interpolation clock.
+
+        ``frame`` is the newest snapshot at or before the clock, ``bird_x``
+        the blended bird positions and ``others`` a list of
+        ``(player_id, x, y, evolution)`` for every other player.
+        """
+        older = newer = None
+        for tick in reversed(self.frames):
+            frame = self.frames[tick]
+            if tick <= self.render_tick:
+                older = frame
+                break
+            newer = frame
+        if older is None:
+            older = newer
+        if older is None:
+            return None, None, []
+        if newer is None or newer.epoch != older.epoch:
+            newer = older
+        t = 0.0 if newer is older else (self.render_tick - older.tick) / (newer.tick - older.tick)
+
+        bird_x = older.bird_x + (newer.bird_x - older.bird_x) * t
+        others = []
+        for player_id, fields in older.players.items():
+            if player_id == self.player_id:
+                continue
+            x, y = fields[0], fields[1]
+            after = newer.players.get(player_id)
+            if after is not None:
+                x += (after[0] - x) * t
+                y += (after[1] - y) * t
+            others.append((player_id, x, y, fields[2]))
+        return older, bird_x, others
+
+
+class MatchView:
+    """Looks enough like a ``GameState`` for ``Renderer.draw()``."""
+
+    camera_x = 0
+    camera_y = 0
+
+    def __init__(self, config):
+        self.config = config
+        self.trail = collections.deque(maxlen=config.max_trail_length)
+        self.birds = Flock(0)
+        self.power_ups = []
+        self.player_x = self.player_y = 0
+        self.player_evolution = 0
+        self.frame = 0
+        self.remaining_time = config.game_duration
+        self.game_over = False
+        self.victory = False
+        self.score = 0
+        self.power_up_active = None
+        self.epoch = None
+
+    def update(self, client, frame, bird_x):
+        if frame.epoch != self.epoch:
+            self.epoch = frame.epoch
+            self.trail.clear()
+        birds = Flock(len(bird_x))
+        birds.x[:] = bird_x
+        birds.y[:] = frame.bird_y
+        birds.color[:] = frame.bird_color
+        birds.captured[:] = frame.bird_captured
+        birds.frame[:] = frame.bird_frame
+        birds.direction[:] = frame.bird_direction
+        self.birds = birds
+
+        self.power_ups = [{'id': power_up_id, 'type': kind, 'x': x, 'y': y,
+                           'radius': power_up_radius, 'color': POWER_UP_COLOR}
+                          for power_up_id, kind, x, y in frame.power_ups]
+
+        latest = client.latest
+        me = latest.players.get(client.player_id)
+        if me is not None:
+            self.player_x, self.player_y = client.predicted
+            _, _, self.player_evolution, self.score, power_up, _ = me
+            self.power_up_active = netcode.POWER_UP_TYPES[power_up]
+            if self.player_evolution == 3:
+                self.trail.append((self.player_x, self.player_y))
+        self.frame += 1
+        self.remaining_time = latest.remaining_time
+        self.game_over = latest.game_over
+        self.victory = latest.game_over and latest.winner == client.player_id
+
+
+def read_inputs():
+    import pygame
+
+    keys = pygame.key.get_pressed()
+    return Inputs(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_UP], keys[pygame.K_DOWN], keys[pygame.K_r])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=netcode.DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    import pygame
+    from game_state import BIRD_COLORS
+    from renderer import HEIGHT, Renderer, WIDTH
+
+    client = MatchClient(args.host, args.port)
+    if not client.join():
+        print(f"no answer from {args.host}", file=sys.stderr)
+        return 1
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"Bird Catcher Game - player {client.player_id}")
+    renderer = Renderer(screen, pygame.font.SysFont(None, 36))
+    view = MatchView(client.config)
+    clock = pygame.time.Clock()
+    previous = None
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        client.send_input(read_inputs())
+        client.poll()
+        client.advance()
+        frame, bird_x, others = client.interpolated()
+        if frame is None or client.predicted is None:
+            clock.tick(FPS)
+            continue
+
+        # Sparkles for birds that got caught since the last drawn frame
+        events = []
+        if previous is not None and previous.epoch == frame.epoch:
+            for i in np.flatnonzero(frame.bird_captured & ~previous.bird_captured).tolist():
+                events.append(("capture", (float(bird_x[i]), float(frame.bird_y[i]),
+                                           BIRD_COLORS[frame.bird_color[i]])))
+        previous = frame
+        renderer.tick(events)
+
+        view.update(client, frame, bird_x)
+        renderer.draw(view, others=[(x, y, evolution) for _, x, y, evolution in others])
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    client.close()
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Gym-style environments for training and evaluating automated players.
+
+``BirdCatcherEnv`` follows the Gymnasium ``reset()``/``step()`` conventions
+without depending on Gymnasium. Actions are the 16 combinations of the four
+arrow keys, packed as bits (1 left, 2 right, 4 up, 8 down). Observations are
+either a compact float32 state vector or the rendered frame as a
+``pygame.surfarray.pixels3d`` view; neither is copied per step, so copy an
+observation if you need it after the next ``step()``.
+
+``VectorEnv`` steps N games in lockstep and writes every game's state into
+one shared (N, size) array, resetting games as they finish.
+"""
+import numpy as np
+
+from game_state import (
+    GameConfig, GameState, Inputs, WIDTH, PLAY_AREA_HEIGHT, player_radius,
+)
+
+# Every arrow-key combination, indexed by its packed bits
+ACTIONS = [Inputs(left=bool(a & 1), right=bool(a & 2), up=bool(a & 4), down=bool(a & 8))
+           for a in range(16)]
+N_ACTIONS = len(ACTIONS)
+
+# Leading state-vector fields, followed by (x, y, captured) for every bird
+STATE_FIELDS = (
+    "player_x", "player_y", "player_speed", "evolution", "remaining_time",
+    "power_up_present", "power_up_x", "power_up_y", "speed_active", "invincibility_active",
+)
+BIRD_FIELDS = 3
+
+# Reward for each captured bird, and on top of that for catching them all
+CAPTURE_REWARD = 1.0
+VICTORY_REWARD = 5.0
+
+
+def observation_size(config):
+    return len(STATE_FIELDS) + BIRD_FIELDS * config.num_birds
+
+
+def write_observation(state, out):
+    """Fill ``out`` (a float32 vector of ``observation_size``) from ``state``."""
+    config = state.config
+    out[0] = state.player_x / WIDTH
+    out[1] = state.player_y / PLAY_AREA_HEIGHT
+    out[2] = state.player_speed / player_radius
+    out[3] = state.player_evolution / 3
+    out[4] = state.remaining_time / config.game_duration
+    if state.power_ups:
+        power_up = state.power_ups[0]
+        out[5:8] = (1, power_up['x'] / WIDTH, power_up['y'] / PLAY_AREA_HEIGHT)
+    else:
+        out[5:8] = 0
+    out[8] = state.power_up_active == "speed"
+    out[9] = state.power_up_active == "invincibility"
+
+    birds = state.birds
+    bird_view = out[len(STATE_FIELDS):].reshape(-1, BIRD_FIELDS)
+    np.divide(birds.x, WIDTH, out=bird_view[:, 0], casting="unsafe")
+    np.divide(birds.y, PLAY_AREA_HEIGHT, out=bird_view[:, 1], casting="unsafe")
+    bird_view[:, 2] = birds.captured
+    return out
+
+
+class BirdCatcherEnv:
+    """One headless game behind a ``reset()``/``step()`` interface.
+
+    With ``observation="pixels"`` each step renders the frame and returns a
+    (width, height, 3) uint8 view straight onto the render surface. The view
+    locks the surface; if it is still referenced when the next frame is
+    drawn, rendering moves to a fresh surface so the old view stays valid.
+    """
+
+    def __init__(self, config=None, seed=None, observation="state", frame_skip=1, out=None):
+        if observation not in ("state", "pixels"):
+            raise ValueError(f"unknown observation type {observation!r}")
+        self.config = config or GameConfig()
+        if observation == "state" and self.config.scrolling:
+            raise ValueError("state observations need a fixed world, with one slot per bird")
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self._seed = seed
+        self.state = None
+        self.n_actions = N_ACTIONS
+        self.observation_size = observation_size(self.config)
+        self._obs = out if out is not None else np.zeros(self.observation_size, dtype=np.float32)
+        self._renderer = None
+        self._pixels = None
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self._seed = seed
+        self.state = GameState(self.config, seed=self._seed)
+        # Later resets without a seed continue from this game's RNG
+        self._seed = self.state.rng.getrandbits(63)
+        self._last_score = 0
+        if self._renderer is not None:
+            self._renderer.sparkles.clear()
+        return self._observe(), {'seed': self.state.seed}
+
+    def step(self, action):
+        state = self.state
+        inputs = ACTIONS[action]
+        won = False
+        for _ in range(self.frame_skip):
+            events = state.step(inputs)
+            if self._renderer is not None:
+                self._renderer.tick(events)
+            if state.game_over:
+                # Only the step that wins is paid for it, not those after
+                won = ("victory", None) in events
+                break
+
+        reward = (state.score - self._last_score) / 50 * CAPTURE_REWARD
+        self._last_score = state.score
+        if won:
+            reward += VICTORY_REWARD
+        info = {'score': state.score, 'evolution': state.player_evolution, 'frame': state.frame}
+        return self._observe(), reward, state.game_over, False, info
+
+    def _observe(self):
+        if self.observation == "state":
+            return write_observation(self.state, self._obs)
+        return self._render_pixels()
+
+    def _render_pixels(self):
+        import pygame
+        from renderer import Renderer, HEIGHT
+
+        if self._renderer is None:
+            pygame.font.init()
+            surface = pygame.Surface((WIDTH, HEIGHT))
+            self._renderer = Renderer(surface, pygame.font.Font(None, 36), seed=self.state.seed)
+
+        # Drop our own view so the surface unlocks; if a caller still holds
+        # one, leave that surface to them and draw on a new one
+        self._pixels = None
+        renderer = self._renderer
+        if renderer.screen.get_locked():
+            renderer.set_screen(pygame.Surface(renderer.screen.get_size()))
+        renderer.draw(self.state)
+        self._pixels = pygame.surfarray.pixels3d(renderer.screen)
+        return self._pixels
+
+    def close(self):
+        self._pixels = None
+        self._renderer = None
+
+
+class VectorEnv:
+    """N state-vector environments stepped in lockstep.
+
+    Observations live in one (N, observation_size) float32 array that each
+    game writes its row of in place. Finished games are reset straight away;
+    the returned ``terminated`` flags still report that they ended.
+
+    This is a convenience for batched agents, not a speedup: games are
+    stepped one after another in a Python loop, so N games take N times as
+    long as one ``BirdCatcherEnv``. For more steps per second, run one
+    process per core.
+    """
+
+    def __init__(self, num_envs, config=None, seed=None, frame_skip=1):
+        config = config or GameConfig()
+        self.num_envs = num_envs
+        self.n_actions = N_ACTIONS
+        self.observation_size = observation_size(config)
+        self.observations = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        seeds = np.random.SeedSequence(seed).generate_state(num_envs, dtype=np.uint64).tolist()
+        self.envs = [BirdCatcherEnv(config, seed=s, frame_skip=frame_skip, out=self.observations[i])
+                     for i, s in enumerate(seeds)]
+
+    def reset(self, seed=None):
+        seeds = (np.random.SeedSequence(seed).generate_state(self.num_envs, dtype=np.uint64).tolist()
+                 if seed is not None else [None] * self.num_envs)
+        for env, s in zip(self.envs, seeds):
+            env.reset(seed=s)
+        return self.observations, {}
+
+    def step(self, actions):
+        rewards = self.rewards
+        terminated = self.terminated
+        scores = []
+        for i, (env, action) in enumerate(zip(self.envs, np.asarray(actions).tolist())):
+            _, rewards[i], terminated[i], _, info = env.step(action)
+            scores.append(info['score'])
+            if terminated[i]:
+                env.reset()
+        return self.observations, rewards, terminated, self.truncated, {'score': scores}
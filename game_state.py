@@ -0,0 +1,414 @@
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from birds import Flock, bird_width
+from profiler import NULL_PROFILER
+from spatial_hash import SpatialHash
+from world import BirdChunks, UNLOAD_MARGIN
+
+# Play area (view) dimensions (the HUD strip below it is a rendering concern)
+WIDTH = 700
+PLAY_AREA_HEIGHT = 600
+
+# Simulation rate
+FPS = 60
+FRAME_MS = 1000 / FPS
+
+BIRD_COLORS = [
+    (255, 0, 0),    # Red
+    (0, 255, 0),    # Green
+    (0, 0, 255),    # Blue
+    (255, 255, 0),  # Yellow
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+]
+
+# Player properties
+player_radius = 30
+
+# Trail properties
+max_trail_length = 20
+
+# Player/bird overlap distance, also used as the broadphase cell size
+capture_radius = player_radius + bird_width // 2
+
+# Power-up properties
+power_up_duration = 5000  # ms
+power_up_radius = 15
+POWER_UP_COLOR = (255, 215, 0)  # Gold color
+
+
+@dataclass
+class GameConfig:
+    """Tunable rules for a single game."""
+    num_birds: int = 6
+    game_duration: int = 60  # seconds
+    max_trail_length: int = max_trail_length
+
+    # Balance knobs: speed in each form (circle, cat, hawk, phoenix), the
+    # captures needed to reach cat/hawk/phoenix, and the per-frame chance of
+    # a power-up appearing
+    player_speeds: tuple = (5, 6, 7, 8)
+    evolution_thresholds: tuple = (2, 4, 6)
+    power_up_chance: float = 0.005
+
+    # A world bigger than the play area scrolls to follow the player, and
+    # its birds are spawned chunk by chunk as the view nears them; there,
+    # num_birds is the number of captures needed to win
+    world_width: int = WIDTH
+    world_height: int = PLAY_AREA_HEIGHT
+    birds_per_chunk: int = 8
+
+    @property
+    def scrolling(self):
+        return self.world_width > WIDTH or self.world_height > PLAY_AREA_HEIGHT
+
+
+class Inputs(NamedTuple):
+    """Player input for one simulation step."""
+    left: bool = False
+    right: bool = False
+    up: bool = False
+    down: bool = False
+    restart: bool = False
+
+
+NO_INPUT = Inputs()
+
+
+class GameState:
+    """Headless game simulation advanced one fixed 60 Hz tick per ``step()``.
+
+    Nothing in here touches the display, the clock or the mixer. Anything the
+    front end needs to react to (sounds, sparkles) is reported through the
+    list of events returned by ``step()``.
+    """
+
+    def __init__(self, config=None, seed=None):
+        self.config = config or GameConfig()
+
+        # Every random draw goes through this per-game generator, so a seed
+        # plus the per-frame inputs fully determines a run
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.profiler = NULL_PROFILER
+        self.reset()
+
+    def reset(self):
+        config = self.config
+        self.player_x = config.world_width // 2
+        self.player_y = config.world_height // 2
+        self.player_speed = self.config.player_speeds[0]
+        self.player_evolution = 0  # 0: circle, 1: cat, 2: hawk, 3: phoenix
+        # Fixed-capacity ring buffer: appending past maxlen drops the oldest point in O(1)
+        self.trail = deque(maxlen=self.config.max_trail_length)
+        self.power_ups = []
+        self.power_up_active = None
+        self.power_up_end_time = 0
+        self.score = 0
+        self.game_over = False
+        self.victory = False
+        self.frame = 0
+        self.birds_captured = 0
+        self.events = []
+        self._update_camera()
+
+        # Broadphase grids, kept in sync as birds drift and power-ups come and go
+        self.bird_grid = SpatialHash(capture_radius)
+        self.power_up_grid = SpatialHash(capture_radius)
+        self._next_power_up_id = 0
+
+        if config.scrolling:
+            self.chunks = BirdChunks(self.rng.getrandbits(63), config.world_width, config.world_height,
+                                     config.birds_per_chunk, len(BIRD_COLORS))
+            self.chunks.stream(self.camera_x, self.camera_y, WIDTH, PLAY_AREA_HEIGHT)
+            self.birds = self.chunks.flock
+        else:
+            self.chunks = None
+            self.birds = spawn_birds(config.num_birds, self.rng)
+        self._index_birds()
+
+    # Rebuild the bird grid from scratch, after the flock itself was replaced
+    def _index_birds(self):
+        self._bird_cells = index_birds(self.birds, self.bird_grid)
+
+    # Bring the bird grid in line with a replacement for the same number of
+    # birds (a restored snapshot), touching only birds whose cell or capture changed
+    def _reindex_birds(self, previous):
+        birds = self.birds
+        grid = self.bird_grid
+        cells = bird_columns(birds, grid)
+        changed = (cells != self._bird_cells) | (birds.y != previous.y) | (birds.captured != previous.captured)
+        for i in np.flatnonzero(changed).tolist():
+            if i in grid:
+                grid.remove(i)
+            if not birds.captured[i]:
+                grid.insert(i, birds.x[i], birds.y[i])
+        self._bird_cells = cells
+
+    # Top-left corner of the view, centred on the player but kept inside the world
+    def _update_camera(self):
+        config = self.config
+        self.camera_x = min(max(self.player_x - WIDTH // 2, 0), config.world_width - WIDTH)
+        self.camera_y = min(max(self.player_y - PLAY_AREA_HEIGHT // 2, 0), config.world_height - PLAY_AREA_HEIGHT)
+
+    # Simulated time, in milliseconds since the game started. Nothing in the
+    # simulation reads the wall clock.
+    @property
+    def time_ms(self):
+        return self.frame * FRAME_MS
+
+    @property
+    def remaining_time(self):
+        elapsed_time = int(self.time_ms) // 1000
+        return max(0, self.config.game_duration - elapsed_time)
+
+    def step(self, inputs=NO_INPUT):
+        """Advance the simulation by one tick and return the events it raised."""
+        self.events = []
+
+        if self.game_over:
+            if inputs.restart:
+                self.reset()
+                self.events.append(("restart", None))
+            else:
+                self.frame += 1
+                return self.events
+
+        remaining_time = self.remaining_time
+        if remaining_time > 0:
+            self._update_power_up()
+            self._move_player(inputs)
+            if self.chunks is not None:
+                self._update_world()
+            self._update_trail()
+            self._update_birds()
+            self.profiler.lap("update")
+            self._check_power_up_collisions()
+            self._check_bird_captures()
+            self.profiler.lap("collisions")
+
+            # Check if all birds are captured; in a scrolling world one tick can
+            # overshoot the capture target
+            if self.birds_captured >= self.config.num_birds:
+                self.game_over = True
+                self.victory = True
+                self.events.append(("victory", None))
+
+            self.spawn_power_up()
+
+        # Check if time is up
+        if remaining_time <= 0 and not self.game_over:
+            self.game_over = True
+            self.victory = False
+            self.events.append(("game_over", None))
+
+        self.frame += 1
+        self.profiler.lap("update")
+        return self.events
+
+    def _update_power_up(self):
+        self.power_up_active, self.player_speed = expire_power_up(
+            self.power_up_active, self.power_up_end_time, self.player_speed, self.player_evolution,
+            self.time_ms, self.config)
+
+    def _move_player(self, inputs):
+        self.player_x, self.player_y = move_player(
+            self.player_x, self.player_y, self.player_speed, inputs, self.config.world_width, self.config.world_height)
+
+    # Follow the player with the camera, streaming chunks in and out around it
+    def _update_world(self):
+        self._update_camera()
+        left, top = self.camera_x, self.camera_y
+        if self.chunks.stream(left, top, WIDTH, PLAY_AREA_HEIGHT):
+            self.birds = self.chunks.flock
+            self._index_birds()
+
+        # A power-up left far behind would block new ones from appearing
+        for power_up in list(self.power_ups):
+            if not (left - UNLOAD_MARGIN < power_up['x'] < left + WIDTH + UNLOAD_MARGIN
+                    and top - UNLOAD_MARGIN < power_up['y'] < top + PLAY_AREA_HEIGHT + UNLOAD_MARGIN):
+                self.power_ups.remove(power_up)
+                self.power_up_grid.remove(power_up['id'])
+
+    def _update_trail(self):
+        # Phoenix leaves flame trail
+        if self.player_evolution == 3:
+            self.trail.append((self.player_x, self.player_y))
+
+    def _update_birds(self):
+        self.birds.update(self.config.world_width)
+        self._bird_cells = move_birds_in_grid(self.birds, self.bird_grid, self._bird_cells)
+
+    # Power-ups the player is touching, without collecting them
+    def power_up_hits(self):
+        if not self.power_ups:
+            return []
+        px, py = self.player_x, self.player_y
+        candidates = self.power_up_grid.query(px, py, player_radius + power_up_radius)
+        if not candidates:
+            return []
+
+        return [power_up for power_up in self.power_ups
+                if power_up['id'] in candidates and touches_power_up(px, py, power_up)]
+
+    def _check_power_up_collisions(self):
+        for power_up in self.power_up_hits():
+            self.power_ups.remove(power_up)
+            self.power_up_grid.remove(power_up['id'])
+            self.power_up_active, self.player_speed, self.power_up_end_time = collect_power_up(
+                power_up['type'], self.power_up_active, self.player_speed, self.time_ms)
+            self.events.append(("power_up", power_up['type']))
+
+    # Indices of the birds the player overlaps, in spawn order, without capturing them
+    def bird_hits(self):
+        return birds_touching(self.birds, self.bird_grid, self.player_x, self.player_y)
+
+    def _check_bird_captures(self):
+        birds = self.birds
+        for i in self.bird_hits():
+            if self.chunks is not None:
+                self.chunks.capture(i)
+            birds.captured[i] = True
+            self.bird_grid.remove(i)
+            self.birds_captured += 1
+            self.score += 50
+            color = BIRD_COLORS[birds.color[i]]
+            self.events.append(("capture", (float(birds.x[i]), float(birds.y[i]), color)))
+            self._check_evolution()
+
+    def _check_evolution(self):
+        level = evolution_after_capture(self.birds_captured, self.player_evolution, self.config)
+        if level is not None:
+            self._evolve(level, self.config.player_speeds[level])
+
+    def _evolve(self, level, speed):
+        self.player_evolution = level
+        self.player_speed = speed
+        self.events.append(("evolve", level))
+
+    def spawn_power_up(self):
+        # One power-up at a time, and none while one is active
+        power_up = roll_power_up(self.rng, self.config, self._next_power_up_id, self.camera_x, self.camera_y,
+                                 blocked=bool(self.power_ups or self.power_up_active))
+        if power_up is not None:
+            self._next_power_up_id += 1
+            self.power_ups.append(power_up)
+            self.power_up_grid.insert(power_up['id'], power_up['x'], power_up['y'])
+
+
+# The rules below are shared with the multiplayer MatchState, which keeps
+# one chaser per player instead of a single player_* set of attributes
+
+
+# Where one tick of input takes a player, staying inside the world
+def move_player(x, y, speed, inputs, width=WIDTH, height=PLAY_AREA_HEIGHT):
+    if inputs.left and x - speed > player_radius:
+        x -= speed
+    if inputs.right and x + speed < width - player_radius:
+        x += speed
+    if inputs.up and y - speed > player_radius:
+        y -= speed
+    if inputs.down and y + speed < height - player_radius:
+        y += speed
+    return x, y
+
+
+# A player's (power_up_active, speed) after any power-up that ran out by time_ms
+def expire_power_up(active, end_time, speed, evolution, time_ms, config):
+    if active and time_ms > end_time:
+        if active == "speed":
+            speed = config.player_speeds[evolution]
+        active = None
+    return active, speed
+
+
+# A player's (power_up_active, speed, power_up_end_time) after picking up a
+# power-up of ``kind``; a second speed boost extends the first rather than stacking
+def collect_power_up(kind, active, speed, time_ms):
+    if kind == "speed" and active != "speed":
+        speed *= 2
+    return kind, speed, time_ms + power_up_duration
+
+
+def touches_power_up(x, y, power_up):
+    dx = x - power_up['x']
+    dy = y - power_up['y']
+    hit = player_radius + power_up['radius']
+    return dx * dx + dy * dy < hit * hit
+
+
+# Roll the per-tick chance of a power-up appearing somewhere in the view at
+# (left, top); None most ticks. The chance is drawn even when ``blocked``,
+# so whether a power-up could appear never shifts the random sequence
+def roll_power_up(rng, config, power_up_id, left=0, top=0, blocked=False):
+    if rng.random() >= config.power_up_chance or blocked:
+        return None
+    x = left + rng.randint(50, WIDTH - 50)
+    y = top + rng.randint(50, PLAY_AREA_HEIGHT - 50)
+    return {
+        'id': power_up_id,
+        'type': "speed" if rng.random() < 0.5 else "invincibility",
+        'x': x,
+        'y': y,
+        'radius': power_up_radius,
+        'color': POWER_UP_COLOR,
+    }
+
+
+# Evolve to cat, hawk, then phoenix: the form reached on this capture, or
+# None if it stays the same
+def evolution_after_capture(birds_captured, evolution, config):
+    for level, threshold in enumerate(config.evolution_thresholds, 1):
+        if birds_captured == threshold and evolution < level:
+            return level
+    return None
+
+
+# Indices of the birds within capture range of (x, y), in spawn order
+def birds_touching(birds, grid, x, y):
+    candidates = grid.query(x, y, capture_radius)
+    if not candidates:
+        return []
+
+    # Only birds in the neighbouring cells can overlap the player; sorting
+    # keeps captures in spawn order like a full scan would
+    candidates = np.sort(np.fromiter(candidates, dtype=np.intp, count=len(candidates)))
+    dx = birds.x[candidates] - x
+    dy = birds.y[candidates] - y
+    return candidates[dx * dx + dy * dy < capture_radius * capture_radius].tolist()
+
+
+def bird_columns(birds, grid):
+    return np.floor(birds.x / grid.cell_size).astype(np.int32)
+
+
+# Put every uncaptured bird in a cleared grid; returns their grid columns
+def index_birds(birds, grid):
+    grid.clear()
+    for i, (x, y) in enumerate(zip(birds.x.tolist(), birds.y.tolist())):
+        if not birds.captured[i]:
+            grid.insert(i, x, y)
+    return bird_columns(birds, grid)
+
+
+# Birds only drift sideways, so a cell change means a new column; only the
+# handful that crossed one since ``cells`` was taken touch the grid.
+# Returns the new columns
+def move_birds_in_grid(birds, grid, cells):
+    new_cells = bird_columns(birds, grid)
+    crossed = new_cells != cells
+    if crossed.any():
+        for i in np.flatnonzero(crossed).tolist():
+            grid.move(i, birds.x[i], birds.y[i])
+    return new_cells
+
+
+# Create birds at random positions (initial spawn and restart alike)
+def spawn_birds(num_birds, rng):
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    return Flock.spawn(num_birds, np_rng, WIDTH, PLAY_AREA_HEIGHT, len(BIRD_COLORS))
@@ -0,0 +1,190 @@
+"""Headless multiplayer simulation: several chasers competing for one flock.
+
+``MatchState`` is the multiplayer counterpart of ``GameState``. It follows
+the same rules (movement, evolution, power-ups, the countdown), through
+the rule helpers in ``game_state.py``, on the fixed-size play area, but
+every player has their own chaser, score and power-up. Birds go to
+whichever player reaches them first; on a tie, the lowest player id wins.
+Nothing in here touches the network or the display; ``server.py`` drives
+it.
+"""
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+from game_state import (
+    FRAME_MS, NO_INPUT, PLAY_AREA_HEIGHT, WIDTH, GameConfig, Inputs, birds_touching, capture_radius,
+    collect_power_up, evolution_after_capture, expire_power_up, index_birds, move_birds_in_grid, move_player,
+    roll_power_up, spawn_birds, touches_power_up,
+)
+from spatial_hash import SpatialHash
+
+# Most players one match takes; player ids fit in a byte on the wire
+MAX_PLAYERS = 255
+
+# Players start evenly spaced on a circle this far from the centre
+SPAWN_RADIUS = 200
+
+
+@dataclass
+class Chaser:
+    """One player's chaser and their standing in the match."""
+    id: int
+    x: int
+    y: int
+    speed: int
+    evolution: int = 0
+    score: int = 0
+    birds_captured: int = 0
+    power_up_active: str = None
+    power_up_end_time: float = 0
+    inputs: Inputs = NO_INPUT
+
+
+class MatchState:
+    """Authoritative simulation of one match, advanced one tick per ``step()``.
+
+    Players join and leave at any time. ``step()`` applies each player's
+    latest ``inputs`` and returns events as ``(name, payload)`` tuples whose
+    payloads start with the player id where one applies. ``epoch`` counts
+    restarts, so observers can tell a new game from the old one.
+    """
+
+    def __init__(self, config=None, seed=None):
+        self.config = config or GameConfig()
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.players = {}
+        self.epoch = 0
+        self.reset()
+
+    def reset(self):
+        self.frame = 0
+        self.game_over = False
+        self.winner = None
+        self.birds = spawn_birds(self.config.num_birds, self.rng)
+        self.birds_captured = 0
+        self.power_ups = []
+        self._next_power_up_id = 0
+        self.bird_grid = SpatialHash(capture_radius)
+        self._bird_cells = index_birds(self.birds, self.bird_grid)
+        for player in self.players.values():
+            self._respawn(player)
+        self.events = []
+
+    @property
+    def time_ms(self):
+        return self.frame * FRAME_MS
+
+    @property
+    def remaining_time(self):
+        elapsed_time = int(self.time_ms) // 1000
+        return max(0, self.config.game_duration - elapsed_time)
+
+    def add_player(self):
+        """Add a chaser and return its id, or None when the match is full."""
+        free = next((i for i in range(MAX_PLAYERS) if i not in self.players), None)
+        if free is not None:
+            self.players[free] = Chaser(free, 0, 0, self.config.player_speeds[0])
+            self._respawn(self.players[free])
+        return free
+
+    def remove_player(self, player_id):
+        self.players.pop(player_id, None)
+
+    def _respawn(self, player):
+        angle = player.id * 2.399963  # golden angle, so any number of players spread out
+        player.x = int(WIDTH // 2 + SPAWN_RADIUS * np.cos(angle))
+        player.y = int(PLAY_AREA_HEIGHT // 2 + SPAWN_RADIUS * np.sin(angle))
+        player.speed = self.config.player_speeds[0]
+        player.evolution = 0
+        player.score = 0
+        player.birds_captured = 0
+        player.power_up_active = None
+        player.power_up_end_time = 0
+
+    def step(self):
+        """Advance one tick using each player's current ``inputs``."""
+        self.events = []
+        players = [self.players[i] for i in sorted(self.players)]
+
+        if self.game_over:
+            if any(player.inputs.restart for player in players):
+                self.epoch += 1
+                self.reset()
+                self.events.append(("restart", None))
+            else:
+                self.frame += 1
+                return self.events
+
+        remaining_time = self.remaining_time
+        if remaining_time > 0:
+            for player in players:
+                self._update_power_up(player)
+                player.x, player.y = move_player(player.x, player.y, player.speed, player.inputs)
+            self._update_birds()
+            for player in players:
+                self._check_power_up_collisions(player)
+                self._check_bird_captures(player)
+
+            if self.birds_captured == len(self.birds):
+                self._finish()
+            self._spawn_power_up()
+
+        if remaining_time <= 0 and not self.game_over:
+            self._finish()
+
+        self.frame += 1
+        return self.events
+
+    # End the match; the best score wins, ties going to the lowest id
+    def _finish(self):
+        self.game_over = True
+        if self.players:
+            best = max(self.players.values(), key=lambda player: (player.score, -player.id))
+            self.winner = best.id
+        self.events.append(("game_over", self.winner))
+
+    def _update_power_up(self, player):
+        player.power_up_active, player.speed = expire_power_up(
+            player.power_up_active, player.power_up_end_time, player.speed, player.evolution,
+            self.time_ms, self.config)
+
+    def _update_birds(self):
+        self.birds.update(WIDTH)
+        self._bird_cells = move_birds_in_grid(self.birds, self.bird_grid, self._bird_cells)
+
+    def _check_bird_captures(self, player):
+        birds = self.birds
+        for i in birds_touching(birds, self.bird_grid, player.x, player.y):
+            birds.captured[i] = True
+            self.bird_grid.remove(i)
+            self.birds_captured += 1
+            player.birds_captured += 1
+            player.score += 50
+            self.events.append(("capture", (player.id, i)))
+            self._check_evolution(player)
+
+    def _check_evolution(self, player):
+        level = evolution_after_capture(player.birds_captured, player.evolution, self.config)
+        if level is not None:
+            player.evolution = level
+            player.speed = self.config.player_speeds[level]
+            self.events.append(("evolve", (player.id, level)))
+
+    def _check_power_up_collisions(self, player):
+        for power_up in list(self.power_ups):
+            if touches_power_up(player.x, player.y, power_up):
+                self.power_ups.remove(power_up)
+                player.power_up_active, player.speed, player.power_up_end_time = collect_power_up(
+                    power_up['type'], player.power_up_active, player.speed, self.time_ms)
+                self.events.append(("power_up", (player.id, power_up['type'])))
+
+    def _spawn_power_up(self):
+        # One power-up at a time. Unlike GameState, one held by a player
+        # doesn't block the next: the others still get their chance at one
+        power_up = roll_power_up(self.rng, self.config, self._next_power_up_id, blocked=bool(self.power_ups))
+        if power_up is not None:
+            self._next_power_up_id += 1
+            self.power_ups.append(power_up)
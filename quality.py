@@ -0,0 +1,101 @@
+"""Adaptive render quality: trade detail for frame rate on slow machines.
+
+``QualityController`` watches how long recent frames took to produce and
+steps through ``QUALITY_LEVELS``: down as soon as frames stop fitting the
+budget, back up only after a long stretch with plenty of headroom. Each
+level is a ``QualityLevel`` for ``Renderer.set_quality()``. The cheapest
+cuts come first: fewer sparkles, a shorter trail and a still phoenix aura
+before the play area drops to a lower resolution.
+"""
+import collections
+from dataclasses import dataclass
+
+from game_state import FPS
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """How much detail the renderer draws."""
+    name: str
+    scale: float = 1.0  # play-area resolution, relative to native
+    max_sparkles: int = None  # live sparkles at most; None for no cap
+    trail_fraction: float = 1.0  # newest share of the phoenix trail to draw
+    simple_aura: bool = False  # a still six-flame phoenix aura instead of the flicker
+
+
+QUALITY_LEVELS = (
+    QualityLevel("high"),
+    QualityLevel("medium", max_sparkles=1000, trail_fraction=0.5),
+    QualityLevel("low", scale=0.75, max_sparkles=400, trail_fraction=0.5, simple_aura=True),
+    QualityLevel("lowest", scale=0.5, max_sparkles=150, trail_fraction=0.25, simple_aura=True),
+)
+
+QUALITY_NAMES = {level.name: level for level in QUALITY_LEVELS}
+
+
+class QualityController:
+    """Picks a quality level from recent frame times, with hysteresis.
+
+    Call ``update(frame_ms)`` after each drawn frame with the time spent
+    producing it (not the time spent waiting for the next one); it returns
+    True when ``level`` changed. Quality drops once the 90th-percentile
+    frame of the last ``window`` frames needs more than ``down_at`` of the
+    budget, and rises after ``up_after`` frames in a row under ``up_at``.
+    Every change is followed by a fresh measurement window. A rise that
+    is undone within ``up_after`` frames doubles the wait before the next
+    rise, so a level that can't hold its frame rate stops being retried
+    every couple of seconds.
+    """
+
+    def __init__(self, levels=QUALITY_LEVELS, budget_ms=1000 / FPS, window=30,
+                 down_at=0.9, up_at=0.6, up_after=2 * FPS, max_up_after=32 * FPS):
+        self.levels = levels
+        self.index = 0
+        self.budget_ms = budget_ms
+        self.down_at = down_at
+        self.up_at = up_at
+        self.base_up_after = up_after
+        self.up_after = up_after
+        self.max_up_after = max_up_after
+        self.changes = 0
+        self._times = collections.deque(maxlen=window)
+        self._calm = 0  # consecutive frames under the step-up threshold
+        self._since_rise = None  # frames since the last step up
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def update(self, frame_ms):
+        times = self._times
+        times.append(frame_ms)
+        if self._since_rise is not None:
+            self._since_rise += 1
+        if len(times) < times.maxlen:
+            return False
+
+        recent = sorted(times)[int(0.9 * (len(times) - 1))]
+        if recent > self.down_at * self.budget_ms and self.index < len(self.levels) - 1:
+            # Stepping straight back down after a rise: that level is too much for now
+            if self._since_rise is not None and self._since_rise <= self.base_up_after:
+                self.up_after = min(2 * self.up_after, self.max_up_after)
+            # Either way the risen level didn't hold
+            self._since_rise = None
+            return self._change(self.index + 1)
+
+        self._calm = self._calm + 1 if recent < self.up_at * self.budget_ms else 0
+        if self._calm >= self.up_after and self.index > 0:
+            self._since_rise = 0
+            return self._change(self.index - 1)
+        # A level that held since its rise has earned the normal wait again
+        if self._since_rise is not None and self._since_rise > self.max_up_after:
+            self.up_after = self.base_up_after
+            self._since_rise = None
+        return False
+
+    def _change(self, index):
+        self.index = index
+        self.changes += 1
+        self._times.clear()
+        self._calm = 0
+        return True
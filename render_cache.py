@@ -0,0 +1,136 @@
+from collections import OrderedDict
+
+import pygame
+
+from game_state import player_radius
+
+
+# Make a freshly drawn surface match the display format for fast blits
+def optimize_surface(surface):
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+    return surface
+
+
+class BackgroundCache:
+    """Pre-rendered play-area gradients, one per intensity step.
+
+    The gradient only changes once ``time_factor`` drops below 0.3, and then
+    only when the whole-second countdown ticks, so a game needs at most a
+    couple of dozen distinct backgrounds. Each is drawn once and afterwards
+    costs a single blit. Entries are kept in LRU order and capped at
+    ``max_entries``; a resize drops every entry built for the old size.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self._size = None
+
+    # Quantize the time factor to the values that actually change the colors
+    @staticmethod
+    def intensity_key(remaining_time, game_duration):
+        time_factor = max(0, min(1, remaining_time / game_duration))
+        if time_factor < 0.3:
+            return time_factor
+        return None
+
+    def get(self, width, height, intensity):
+        size = (width, height)
+        if size != self._size:
+            self._surfaces.clear()
+            self._size = size
+
+        surface = self._surfaces.get(intensity)
+        if surface is None:
+            surface = self._build(width, height, intensity)
+            self._surfaces[intensity] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(intensity)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @staticmethod
+    def _build(width, height, intensity):
+        # Create a gradient from dark blue to purple
+        surface = pygame.Surface((width, height))
+        for y in range(height):
+            r = int(20 + (y / height) * 40)
+            g = int(10 + (y / height) * 20)
+            b = int(50 + (y / height) * 100)
+
+            # Make colors more intense as time runs out
+            if intensity is not None:
+                r = min(255, int(r * (1.5 - intensity)))
+
+            pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+        return optimize_surface(surface)
+
+
+class TextCache:
+    """Rendered text surfaces keyed by string and color, evicted LRU.
+
+    HUD values change at most once a second, so after the first frame
+    ``render()`` is a dictionary hit instead of a font rasterization.
+    """
+
+    def __init__(self, font, max_entries=128):
+        self.font = font
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+class TrailStamps:
+    """Pre-baked fading circles for the phoenix trail, one per trail index.
+
+    Point ``i`` of a trail with capacity ``length`` is drawn with the stamp
+    at index ``i``, so a frame's trail is a single ``blits()`` call with no
+    surface allocation. Tables are kept per capacity and scale.
+    """
+
+    def __init__(self, color=(255, 100, 0)):
+        self.color = color
+        self._tables = {}
+
+    # (stamp, radius) pairs for every index of a trail of the given capacity
+    def get(self, length, scale=1.0):
+        key = (length, scale)
+        table = self._tables.get(key)
+        if table is None:
+            table = [self._build(i, length, scale) for i in range(length)]
+            self._tables[key] = table
+        return table
+
+    def _build(self, i, length, scale):
+        # Make trail fade out
+        alpha = int(255 * (i / length))
+        radius = int(player_radius * 0.7 * (i / length) * scale)
+
+        stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, self.color + (alpha,), (radius, radius), radius)
+        return optimize_surface(stamp), radius
@@ -0,0 +1,331 @@
+from itertools import islice
+
+import numpy as np
+import pygame
+
+from birds import bird_height, bird_width
+from game_state import WIDTH, PLAY_AREA_HEIGHT, BIRD_COLORS
+from particles import ParticleSystem
+from profiler import NULL_PROFILER
+from render_cache import BackgroundCache, TextCache, TrailStamps, optimize_surface
+from sprites import BLACK, SpriteAtlas
+
+HEIGHT = 800
+
+# Colors
+WHITE = (255, 255, 255)
+HUD_COLOR = (50, 50, 50)
+
+evolution_names = ["Circle", "Cat", "Hawk", "Phoenix"]
+
+
+class Renderer:
+    """Draws a ``GameState`` onto a surface.
+
+    Purely visual state (capture sparkles) lives here rather than in the
+    simulation, so headless runs never pay for it.
+
+    With ``dirty_rects`` enabled, ``draw()`` only restores the cached
+    background under what was drawn last frame and returns the list of
+    rects that changed, for ``pygame.display.update(rects)``. It returns
+    ``None`` whenever the whole screen must be pushed instead: the first
+    frame, a background intensity step, the game-over screen, or too many
+    rects to be worth it.
+
+    ``set_quality()`` trades detail for speed (see ``quality.py``). Below
+    full scale the play area is drawn onto a smaller offscreen canvas and
+    scaled up into the screen each frame, while the HUD stays sharp; that
+    always redraws the whole frame.
+    """
+
+    def __init__(self, screen, font, dirty_rects=False, max_dirty_rects=256, seed=None):
+        self.screen = screen
+        self.font = font
+        self.text = TextCache(font)
+        self.sparkles = ParticleSystem(rng=np.random.default_rng(seed))
+        self.backgrounds = BackgroundCache()
+        self.sprites = SpriteAtlas()
+        self.trail_stamps = TrailStamps()
+
+        # Render quality: the play area is drawn onto ``canvas`` at ``scale``,
+        # where it covers ``canvas_size`` pixels
+        self.scale = 1.0
+        self.canvas = screen
+        self.canvas_size = (WIDTH, PLAY_AREA_HEIGHT)
+        self.trail_fraction = 1.0
+        self.simple_aura = False
+        self._atlases = {1.0: self.sprites}
+        self._play_view = None
+
+        self.profiler = NULL_PROFILER
+        self._profiler_text = None
+        self.dirty_rects = dirty_rects
+        self.max_dirty_rects = max_dirty_rects
+        self.play_rect = pygame.Rect(0, 0, WIDTH, PLAY_AREA_HEIGHT)
+        self.hud_rect = pygame.Rect(0, PLAY_AREA_HEIGHT, WIDTH, HEIGHT - PLAY_AREA_HEIGHT)
+        self._dirty = []
+        self._prev_rects = None
+        self._prev_intensity = None
+        self._prev_game_over = False
+        self._prev_camera = None
+        self._game_over_key = None
+        self._game_over_layer = None
+        # Best scores so far, listed on the game-over screen
+        self.high_scores = ()
+
+    # Apply a ``quality.QualityLevel``
+    def set_quality(self, level):
+        self.sparkles.limit = level.max_sparkles
+        self.trail_fraction = level.trail_fraction
+        self.simple_aura = level.simple_aura
+        if level.scale == self.scale:
+            return
+        self.scale = level.scale
+        self.sprites = self._atlases.get(level.scale)
+        if self.sprites is None:
+            self.sprites = self._atlases[level.scale] = SpriteAtlas(level.scale)
+        if level.scale == 1:
+            self.canvas_size = (WIDTH, PLAY_AREA_HEIGHT)
+        else:
+            self.canvas_size = (round(WIDTH * level.scale), round(PLAY_AREA_HEIGHT * level.scale))
+        self.set_screen(self.screen)
+
+    # Draw onto another surface from now on, keeping the current quality
+    def set_screen(self, screen):
+        reusable = self.canvas is not self.screen and self.canvas.get_size() == self.canvas_size
+        self.screen = screen
+        if self.scale == 1:
+            self.canvas = screen
+            self._play_view = None
+        else:
+            if not reusable:
+                self.canvas = optimize_surface(pygame.Surface(self.canvas_size))
+            self._play_view = screen.subsurface(self.play_rect)
+        self._prev_rects = None
+
+    # Advance visual effects by one simulation tick, after its events
+    def tick(self, events):
+        self.handle_events(events)
+        self.sparkles.update()
+
+    def handle_events(self, events):
+        for name, payload in events:
+            if name == "capture":
+                x, y, color = payload
+                self.sparkles.emit(x, y, color)
+            elif name == "restart":
+                self.sparkles.clear()
+
+    # ``others`` lists (x, y, evolution) for other players' chasers, in multiplayer
+    def draw(self, state, others=()):
+        intensity = self.backgrounds.intensity_key(state.remaining_time, state.config.game_duration)
+        canvas = self.canvas
+        background = self.backgrounds.get(*self.canvas_size, intensity)
+
+        # World positions are drawn relative to the camera; when it scrolls,
+        # everything on screen moves and dirty rects don't pay off
+        camera = (state.camera_x, state.camera_y)
+        full = (not self.dirty_rects or self._prev_rects is None or intensity != self._prev_intensity
+                or state.game_over or self._prev_game_over or camera != self._prev_camera
+                or canvas is not self.screen)
+        self._prev_intensity = intensity
+        self._prev_game_over = state.game_over
+        self._prev_camera = camera
+
+        restored = []
+        if full:
+            canvas.blit(background, (0, 0))
+            self.draw_hud_background()
+        else:
+            restored = self._restore(background, self._prev_rects)
+        self._dirty = []
+        profiler = self.profiler
+        profiler.lap("background")
+
+        # Keep the world out of the HUD strip
+        canvas.set_clip(self.play_rect if canvas is self.screen else None)
+        self.draw_trail(state.trail, camera)
+        profiler.lap("trail")
+        self.draw_sparkles(camera)
+        profiler.lap("sparkles")
+        self.draw_birds(state.birds, camera)
+        self.draw_power_ups(state.power_ups, camera)
+        for x, y, evolution in others:
+            self.draw_player(x - camera[0], y - camera[1], evolution, state.frame)
+        self.draw_player(state.player_x - camera[0], state.player_y - camera[1], state.player_evolution, state.frame)
+        canvas.set_clip(None)
+        if canvas is not self.screen:
+            pygame.transform.scale(canvas, self.play_rect.size, self._play_view)
+        profiler.lap("entities")
+
+        self.draw_hud(state)
+        if profiler.overlay_visible:
+            self.draw_profiler_overlay()
+
+        if state.game_over:
+            self.draw_game_over(state)
+        profiler.lap("hud")
+
+        self._prev_rects = self._dirty
+        if full or len(restored) + len(self._dirty) > self.max_dirty_rects:
+            return None
+        return restored + self._dirty
+
+    # Paint the background back over last frame's rects
+    def _restore(self, background, rects):
+        screen = self.screen
+        restored = []
+        for rect in rects:
+            play_part = rect.clip(self.play_rect)
+            if play_part:
+                screen.blit(background, play_part, play_part)
+            hud_part = rect.clip(self.hud_rect)
+            if hud_part:
+                screen.fill(HUD_COLOR, hud_part)
+            restored.append(rect)
+        return restored
+
+    # Record what was drawn this frame when tracking dirty rects
+    def _track(self, rects):
+        if self.dirty_rects:
+            if isinstance(rects, pygame.Rect):
+                self._dirty.append(rects)
+            else:
+                self._dirty.extend(rects)
+
+    # Blit the cached gradient background for the current intensity step
+    def draw_gradient_background(self, remaining_time, game_duration):
+        intensity = self.backgrounds.intensity_key(remaining_time, game_duration)
+        self.canvas.blit(self.backgrounds.get(*self.canvas_size, intensity), (0, 0))
+
+    # Draw sparkles; they move in tick(), not here
+    def draw_sparkles(self, camera=(0, 0)):
+        self._track(self.sparkles.draw(self.canvas, doreturn=self.dirty_rects, offset=camera, scale=self.scale))
+
+    # Draw trail for phoenix, fading out towards its oldest point; lower
+    # quality drops the oldest, faintest part
+    def draw_trail(self, trail, camera=(0, 0)):
+        if not trail:
+            return
+        scale = self.scale
+        stamps = self.trail_stamps.get(trail.maxlen, scale)
+        start = len(trail) - int(len(trail) * self.trail_fraction)
+        cx, cy = camera
+        self._track(self.canvas.blits([
+            (stamp, ((trail_x - cx) * scale - radius, (trail_y - cy) * scale - radius))
+            for (stamp, radius), (trail_x, trail_y) in zip(islice(stamps, start, None), islice(trail, start, None))
+            if radius
+        ], doreturn=self.dirty_rects) or [])
+
+    # Blit every uncaptured bird in view from the sprite atlas
+    def draw_birds(self, birds, camera=(0, 0)):
+        cx, cy = camera
+        alive = birds.alive
+        x, y = birds.x[alive], birds.y[alive]
+        alive = alive[(x > cx - bird_width) & (x < cx + WIDTH + bird_width)
+                      & (y > cy - bird_height) & (y < cy + PLAY_AREA_HEIGHT + bird_height)]
+        if not len(alive):
+            return
+        scale = self.scale
+        ax, ay = self.sprites.bird_anchor
+        ax += cx * scale
+        ay += cy * scale
+        xs, ys = birds.x[alive], birds.y[alive]
+        if scale != 1:
+            xs, ys = xs * scale, ys * scale
+        bird_sprite = self.sprites.bird
+        self._track(self.canvas.blits([
+            (bird_sprite(BIRD_COLORS[color], frame, direction), (x - ax, y - ay))
+            for x, y, color, frame, direction in zip(
+                xs.tolist(), ys.tolist(), birds.color[alive].tolist(),
+                birds.frame[alive].tolist(), birds.direction[alive].tolist())
+        ], doreturn=self.dirty_rects))
+
+    # Blit the player sprite for its evolution level, animated by simulation tick
+    def draw_player(self, x, y, evolution, tick=0):
+        sprite = self.sprites.player(evolution, tick, self.simple_aura)
+        ax, ay = self.sprites.player_anchor
+        self._track(self.canvas.blit(sprite, (x * self.scale - ax, y * self.scale - ay)))
+
+    # Draw power-ups
+    def draw_power_ups(self, power_ups, camera=(0, 0)):
+        canvas = self.canvas
+        scale = self.scale
+        # Icon size and line width, at least a pixel whatever the scale
+        arm, width = max(1, round(5 * scale)), max(1, round(2 * scale))
+        for power_up in power_ups:
+            x = round((power_up['x'] - camera[0]) * scale)
+            y = round((power_up['y'] - camera[1]) * scale)
+            self._track(pygame.draw.circle(canvas, power_up['color'], (x, y), max(1, round(power_up['radius'] * scale))))
+
+            # Draw icon based on power-up type
+            if power_up['type'] == "speed":
+                # Draw lightning bolt
+                pygame.draw.line(canvas, BLACK, (x - arm, y - arm), (x + arm, y + arm), width)
+                pygame.draw.line(canvas, BLACK, (x + arm, y - arm), (x - arm, y + arm), width)
+            elif power_up['type'] == "invincibility":
+                # Draw shield shape
+                pygame.draw.circle(canvas, BLACK, (x, y), max(2, round(7 * scale)), width)
+
+    # Draw UI background at bottom
+    def draw_hud_background(self):
+        pygame.draw.rect(self.screen, HUD_COLOR, self.hud_rect)
+
+    def draw_hud(self, state):
+        screen = self.screen
+        text = self.text.render
+
+        # Draw score
+        self._track(screen.blit(text(f"Score: {state.score}", WHITE), (20, PLAY_AREA_HEIGHT + 30)))
+
+        # Draw timer
+        self._track(screen.blit(text(f"Time: {state.remaining_time}s", WHITE), (WIDTH - 150, PLAY_AREA_HEIGHT + 30)))
+
+        # Draw evolution status
+        self._track(screen.blit(text(f"Form: {evolution_names[state.player_evolution]}", WHITE),
+                                (WIDTH // 2 - 70, PLAY_AREA_HEIGHT + 30)))
+
+        # Draw active power-up
+        if state.power_up_active:
+            self._track(screen.blit(text(f"Power-up: {state.power_up_active.capitalize()}", (255, 215, 0)),
+                                    (20, PLAY_AREA_HEIGHT + 70)))
+
+    # Frame-time summary in the free space at the bottom of the HUD strip
+    def draw_profiler_overlay(self):
+        if self._profiler_text is None:
+            self._profiler_text = TextCache(pygame.font.Font(None, 20), max_entries=16)
+        if self.dirty_rects:
+            # The lines change in place, so clear the area they use
+            area = pygame.Rect(20, PLAY_AREA_HEIGHT + 110, WIDTH - 40, HEIGHT - PLAY_AREA_HEIGHT - 115)
+            self.screen.fill(HUD_COLOR, area)
+            self._track(area)
+        self._track(self.profiler.draw_overlay(self.screen, self._profiler_text, 20, PLAY_AREA_HEIGHT + 110))
+
+    def draw_game_over(self, state):
+        key = (state.victory, state.score, self.high_scores)
+        if key != self._game_over_key:
+            self._game_over_layer = self._build_game_over(state)
+            self._game_over_key = key
+        self.screen.blit(self._game_over_layer, (0, 0))
+
+    # Build the overlay and messages once per game-over state
+    def _build_game_over(self, state):
+        text = self.text.render
+
+        # Create semi-transparent overlay
+        layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        layer.fill((0, 0, 0, 150))
+
+        if state.victory:
+            message = "Victory! All birds captured!"
+        else:
+            message = "Game Over! Time's up!"
+
+        # Main message, final score, restart instruction and the high scores
+        lines = [(message, -30), (f"Final Score: {state.score}", 30), ("Press R to restart", 80)]
+        if self.high_scores:
+            lines.append(("Best: " + ", ".join(str(score) for score in self.high_scores), 130))
+        for line, dy in lines:
+            surface = text(line, WHITE)
+            layer.blit(surface, surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + dy)))
+        return optimize_surface(layer)
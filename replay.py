@@ -0,0 +1,201 @@
+"""Seeded input recordings and headless replay.
+
+A recording is the game's seed and config plus one packed byte of key state
+per frame (zlib-compressed, so held keys cost next to nothing). Replaying it
+re-simulates the game headless as fast as ``GameState.step()`` allows.
+Recordings can also carry periodic state checksums to prove the replay took
+the same path as the original run.
+
+Run from the repository root:
+
+    python replay.py recording.bcr
+"""
+import dataclasses
+import json
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from game_state import GameConfig, GameState, Inputs
+
+MAGIC = b"BCRP"
+VERSION = 1
+
+# Bit assigned to each key in a packed frame
+INPUT_BITS = {name: 1 << i for i, name in enumerate(Inputs._fields)}
+
+# Every possible packed byte decoded once up front
+_UNPACKED = [Inputs(*(bool(bits & INPUT_BITS[name]) for name in Inputs._fields))
+             for bits in range(1 << len(Inputs._fields))]
+
+_HEADER = struct.Struct("<4sBQII")   # magic, version, seed, config length, frame count
+_SECTION = struct.Struct("<II")      # hash interval, compressed frames length
+
+
+class ReplayMismatch(Exception):
+    """A replayed game diverged from the checksums in its recording."""
+
+    def __init__(self, frame, expected, actual):
+        super().__init__(f"state diverged at frame {frame}: expected {expected:08x}, got {actual:08x}")
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+def pack_inputs(inputs):
+    bits = 0
+    for name, bit in INPUT_BITS.items():
+        if getattr(inputs, name):
+            bits |= bit
+    return bits
+
+
+def unpack_inputs(bits):
+    return _UNPACKED[bits]
+
+
+# CRC of everything that decides how the game plays out from here
+def state_hash(state):
+    crc = zlib.crc32(struct.pack(
+        "<qddiiq??d", state.frame, state.player_x, state.player_y, state.player_speed,
+        state.player_evolution, state.score, state.game_over, state.victory, state.power_up_end_time))
+    birds = state.birds
+    for array in (birds.x, birds.captured, birds.frame, birds.offset_direction):
+        crc = zlib.crc32(array.tobytes(), crc)
+    for power_up in state.power_ups:
+        crc = zlib.crc32(struct.pack("<ii", power_up['x'], power_up['y']), crc)
+        crc = zlib.crc32(power_up['type'].encode(), crc)
+    crc = zlib.crc32(repr(state.power_up_active).encode(), crc)
+    return crc
+
+
+@dataclasses.dataclass
+class Recording:
+    """A seed, a config and the packed inputs for every frame of a run."""
+    seed: int
+    config: GameConfig
+    frames: bytearray = dataclasses.field(default_factory=bytearray)
+    hash_interval: int = 0
+    hashes: list = dataclasses.field(default_factory=list)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def to_bytes(self):
+        config = json.dumps(dataclasses.asdict(self.config), sort_keys=True).encode()
+        frames = zlib.compress(bytes(self.frames), 9)
+        hashes = np.asarray(self.hashes, dtype="<u4").tobytes()
+        return b"".join((
+            _HEADER.pack(MAGIC, VERSION, self.seed, len(config), len(self.frames)),
+            config,
+            _SECTION.pack(self.hash_interval, len(frames)),
+            frames,
+            hashes,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, config_len, frame_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a bird catcher recording")
+        if version != VERSION:
+            raise ValueError(f"unsupported recording version {version}")
+        offset = _HEADER.size
+        fields = json.loads(data[offset:offset + config_len])
+        config = GameConfig(**{k: tuple(v) if isinstance(v, list) else v for k, v in fields.items()})
+        offset += config_len
+        hash_interval, frames_len = _SECTION.unpack_from(data, offset)
+        offset += _SECTION.size
+        frames = bytearray(zlib.decompress(data[offset:offset + frames_len]))
+        offset += frames_len
+        hashes = np.frombuffer(data[offset:], dtype="<u4").tolist()
+        if len(frames) != frame_count:
+            raise ValueError("truncated recording")
+        return cls(seed, config, frames, hash_interval, hashes)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class InputRecorder:
+    """Records the inputs fed to a ``GameState``, one packed byte per frame.
+
+    Call ``record()`` with the same inputs right before each ``step()``. With
+    ``hash_interval`` set, the state checksum after every that-many frames is
+    stored as well.
+    """
+
+    def __init__(self, state, hash_interval=0):
+        self.state = state
+        self.recording = Recording(state.seed, state.config, hash_interval=hash_interval)
+
+    def record(self, inputs):
+        self.recording.frames.append(pack_inputs(inputs))
+
+    # Call after step() to capture the checksum for the frame just simulated
+    def after_step(self):
+        recording = self.recording
+        if recording.hash_interval and len(recording.frames) % recording.hash_interval == 0:
+            recording.hashes.append(state_hash(self.state))
+
+    def save(self, path):
+        self.recording.save(path)
+
+
+def replay(recording, verify=True):
+    """Re-simulate a recording headless and return the final ``GameState``.
+
+    Raises ``ReplayMismatch`` at the first checksum that does not match when
+    ``verify`` is set.
+    """
+    state = GameState(recording.config, seed=recording.seed)
+    interval = recording.hash_interval if verify else 0
+    hashes = recording.hashes
+    step = state.step
+
+    for frame, bits in enumerate(recording.frames, 1):
+        step(_UNPACKED[bits])
+        if interval and frame % interval == 0:
+            index = frame // interval - 1
+            if index < len(hashes):
+                actual = state_hash(state)
+                if actual != hashes[index]:
+                    raise ReplayMismatch(frame, hashes[index], actual)
+    return state
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python replay.py RECORDING", file=sys.stderr)
+        return 2
+
+    recording = Recording.load(argv[0])
+    start = time.perf_counter()
+    try:
+        state = replay(recording)
+    except ReplayMismatch as exc:
+        print(f"replay FAILED: {exc}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    frames = len(recording)
+    print(f"seed {recording.seed}: {frames} frames in {elapsed:.3f}s ({frames / max(elapsed, 1e-9):.0f} fps)")
+    print(f"final score {state.score}, form {state.player_evolution}, "
+          f"{'victory' if state.victory else 'no victory'}, state hash {state_hash(state):08x}")
+    if recording.hash_interval:
+        print(f"verified {len(recording.hashes)} checksums")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Local high-score table in SQLite, written from a background thread.
+
+``ScoreStore.add()`` only queues the entry; a writer thread drains the
+queue in batches and commits each batch as one transaction, so disk syncs
+never happen on the caller's thread and bot sweeps can record thousands of
+games a second. ``top()`` answers from a cache that is only dropped when a
+batch has been committed.
+
+Scores are indexed by score, by date and by seed, so the overall table,
+the best of a period and the best on one seed are all index scans.
+
+Run from the repository root to print the table:
+
+    python scores.py --top 10
+    python scores.py --seed 7
+"""
+import argparse
+import dataclasses
+import logging
+import operator
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".bird_catcher_scores.db")
+
+# Scores are keyed by seed in a signed 64-bit SQLite column
+MAX_SEED = 2 ** 63 - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    played_at REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    victory INTEGER NOT NULL,
+    evolution INTEGER NOT NULL,
+    birds_captured INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    num_birds INTEGER NOT NULL,
+    game_duration INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, played_at);
+CREATE INDEX IF NOT EXISTS scores_by_date ON scores (played_at);
+CREATE INDEX IF NOT EXISTS scores_by_seed ON scores (seed, score DESC);
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoreEntry:
+    """One finished game."""
+    score: int
+    seed: int
+    player: str = "you"
+    victory: bool = False
+    evolution: int = 0
+    birds_captured: int = 0
+    frames: int = 0
+    num_birds: int = 0
+    game_duration: int = 0
+    played_at: float = dataclasses.field(default_factory=time.time)  # Unix time
+
+    def __post_init__(self):
+        if not 0 <= self.seed <= MAX_SEED:
+            raise ValueError(f"seed must be between 0 and {MAX_SEED}, got {self.seed}")
+
+    @classmethod
+    def from_state(cls, state, player="you"):
+        return cls(state.score, state.seed, player, state.victory, state.player_evolution,
+                   state.birds_captured, state.frame, state.config.num_birds, state.config.game_duration)
+
+
+_FIELDS = [field.name for field in dataclasses.fields(ScoreEntry)]
+_ROW = operator.attrgetter(*_FIELDS)
+_INSERT = f"INSERT INTO scores ({', '.join(_FIELDS)}) VALUES ({', '.join('?' * len(_FIELDS))})"
+
+
+class ScoreStore:
+    """A SQLite score table with queued, batched writes and cached reads.
+
+    ``add()`` never touches the disk. The writer thread commits up to
+    ``batch_size`` queued entries per transaction; when writes arrive faster
+    than one commit takes, batches simply grow. Past ``max_pending``
+    queued entries ``add()`` blocks until the writer catches up rather than
+    growing without bound. ``flush()`` waits for everything queued so far
+    to be committed; ``close()`` flushes and stops the writer.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=1024, max_pending=100000):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.error = None
+
+        # Readers use this connection; the writer thread opens its own
+        self._db = _connect(path)
+        self._db.executescript(_SCHEMA)
+        self._read_lock = threading.Lock()
+        self._cache = {}
+        self._cache_generation = 0
+        self._generation = 0  # bumped after every committed batch
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, entry):
+        """Queue ``entry`` for writing; False if the store can't take it."""
+        if self._closed or self.error is not None:
+            self.dropped += 1
+            return False
+        self._queue.put(entry)
+        return True
+
+    def top(self, n=10, seed=None, since=None):
+        """The ``n`` best entries, optionally on one seed or played since a Unix time.
+
+        Ties go to whoever got there first.
+        """
+        key = (n, seed, since)
+        with self._read_lock:
+            if self._cache_generation != self._generation:
+                self._cache.clear()
+                self._cache_generation = self._generation
+            entries = self._cache.get(key)
+            if entries is None:
+                entries = self._cache[key] = self._query(n, seed, since)
+        return entries
+
+    def _query(self, n, seed, since):
+        where, params = [], []
+        if seed is not None:
+            where.append("seed = ?")
+            params.append(seed)
+        if since is not None:
+            where.append("played_at >= ?")
+            params.append(since)
+        sql = f"SELECT {', '.join(_FIELDS)} FROM scores"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC, played_at LIMIT ?"
+        rows = self._db.execute(sql, (*params, n)).fetchall()
+        return tuple(ScoreEntry(*row[:3], bool(row[3]), *row[4:]) for row in rows)
+
+    def count(self):
+        with self._read_lock:
+            return self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def flush(self):
+        """Block until every entry queued so far is committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit what's queued, stop the writer thread and close the database."""
+        if self._thread is None:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._db.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Whatever goes wrong, the thread keeps draining the queue so flush()
+    # and close() return, and the error surfaces through ``error``
+    def _write_loop(self):
+        db = None
+        try:
+            db = _connect(self.path)
+        except Exception as exc:
+            self._fail(exc)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries and self.error is None:
+                    self._write(db, entries)
+            except Exception as exc:
+                self._fail(exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                break
+        if db is not None:
+            db.close()
+
+    def _fail(self, exc):
+        log.error("saving scores stopped: %s", exc)
+        self.error = exc
+
+    def _write(self, db, entries):
+        with db:
+            db.executemany(_INSERT, map(_ROW, entries))
+        self.written += len(entries)
+        self.batches += 1
+        with self._read_lock:
+            self._generation += 1
+
+
+def _connect(path):
+    db = sqlite3.connect(path, check_same_thread=False)
+    # Readers don't block the writer, and commits only sync at checkpoints
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the high-score table.")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, help="only games played on this seed")
+    parser.add_argument("--days", type=float, help="only games from the last this many days")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"no scores yet at {args.path}", file=sys.stderr)
+        return 1
+    since = time.time() - args.days * 86400 if args.days is not None else None
+    with ScoreStore(args.path) as store:
+        entries = store.top(args.top, args.seed, since)
+    for rank, entry in enumerate(entries, 1):
+        played = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.played_at))
+        print(f"{rank:3d}. {entry.score:6d}  {entry.player:8s} form {entry.evolution}"
+              f"{'  victory' if entry.victory else '':9s}  seed {entry.seed}  {played}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
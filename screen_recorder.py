@@ -0,0 +1,224 @@
+"""Record gameplay video without stalling the game loop.
+
+``ScreenRecorder.capture(surface)`` copies the finished frame's raw pixels
+into one of a few preallocated buffers and returns; a background thread
+converts buffered frames to RGB and writes them out, either to a single
+memory-mapped raw video file or as a PNG sequence. When every buffer is
+still waiting on the writer, the recorder drops the frame (the default) or
+blocks until one frees up.
+
+Raw files start with a 16-byte little-endian header
+``b"BCRV", version, width, height, fps, frame count`` followed by
+``width * height * 3`` bytes of RGB per frame, so they load straight into
+NumPy, or into ffmpeg with ``-f rawvideo -pix_fmt rgb24 -s WxH``
+after skipping the header.
+"""
+import logging
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+RAW_MAGIC = b"BCRV"
+RAW_VERSION = 1
+RAW_HEADER = struct.Struct("<4sHHHHI")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Fast zlib level: frames are mostly flat colour and compress well anyway
+PNG_COMPRESSION = 1
+
+# Frames the raw file grows by whenever it runs out of room
+RAW_GROW_FRAMES = 120
+
+
+class ScreenRecorder:
+    """Copies frames into a ring of buffers for a writer thread to save.
+
+    ``path`` ending in ``.rgb`` or ``.raw`` writes one raw video file;
+    anything else is a directory for ``frame_000000.png`` files, numbered
+    by capture call so dropped frames show up as gaps. ``policy`` is
+    ``"drop"`` or ``"block"``.
+    """
+
+    def __init__(self, path, size, fps=60, buffers=8, policy="drop"):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"unknown policy {policy!r}")
+        self.path = path
+        self.width, self.height = size
+        self.fps = fps
+        self.policy = policy
+        self.raw = path.endswith((".rgb", ".raw"))
+
+        self.frames = 0  # capture() calls
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+        self._slots = None  # (buffers, height, pitch) uint8, sized on first capture
+        self._buffers = buffers
+        self._layout = None
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        for i in range(buffers):
+            self._free.put(i)
+
+        self._file = None
+        self._map = None
+        self._rgb = None
+        self._capacity = 0
+        if self.raw:
+            self._open_raw()
+        else:
+            os.makedirs(path, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._write_loop, name="screen-recorder", daemon=True)
+        self._thread.start()
+
+    def capture(self, surface):
+        """Queue a copy of ``surface``; returns False if the frame was dropped."""
+        index = self.frames
+        self.frames += 1
+        if self.error is not None:
+            self.dropped += 1
+            return False
+
+        if self._slots is None:
+            self._allocate(surface)
+        try:
+            slot = self._free.get(block=self.policy == "block")
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        # A straight copy of the surface memory; channel shuffling happens
+        # on the writer thread
+        pixels = surface.get_buffer()
+        np.copyto(self._slots[slot], np.frombuffer(pixels, dtype=np.uint8).reshape(self._slots.shape[1:]))
+        del pixels
+        self._ready.put((slot, index))
+        return True
+
+    def close(self):
+        """Flush queued frames, finish the file and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._ready.put(None)
+        self._thread.join()
+        self._thread = None
+        if self.raw:
+            self._close_raw()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _allocate(self, surface):
+        if surface.get_size() != (self.width, self.height):
+            raise ValueError(f"surface is {surface.get_size()}, recorder expects {(self.width, self.height)}")
+        bytesize = surface.get_bytesize()
+        if bytesize not in (3, 4):
+            raise ValueError(f"can't record {bytesize * 8}-bit surfaces")
+        # Byte offset of red, green and blue inside each pixel
+        order = []
+        for shift in surface.get_shifts()[:3]:
+            byte = shift // 8
+            order.append(byte if sys.byteorder == "little" else bytesize - 1 - byte)
+        self._layout = (bytesize, order)
+        self._slots = np.zeros((self._buffers, self.height, surface.get_pitch()), dtype=np.uint8)
+
+    # Convert a slot's raw pixels into ``out``, a (height, width, 3) RGB array
+    def _to_rgb(self, slot, out):
+        bytesize, order = self._layout
+        pixels = self._slots[slot][:, :self.width * bytesize].reshape(self.height, self.width, bytesize)
+        for channel, byte in enumerate(order):
+            out[:, :, channel] = pixels[:, :, byte]
+        return out
+
+    def _write_loop(self):
+        while True:
+            item = self._ready.get()
+            if item is None:
+                return
+            slot, index = item
+            try:
+                if self.error is None:
+                    if self.raw:
+                        self._write_raw(slot)
+                    else:
+                        self._write_png(slot, index)
+                    self.written += 1
+            except (OSError, ValueError) as exc:
+                log.error("screen recording stopped: %s", exc)
+                self.error = exc
+            finally:
+                self._free.put(slot)
+
+    # Encoded by hand rather than with pygame.image.save, because zlib
+    # releases the GIL while compressing and pygame doesn't
+    def _write_png(self, slot, index):
+        if self._rgb is None:
+            # Each row is prefixed with PNG filter type 0 (none)
+            self._rgb = np.zeros((self.height, 1 + self.width * 3), dtype=np.uint8)
+        self._to_rgb(slot, self._rgb[:, 1:].reshape(self.height, self.width, 3))
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        with open(os.path.join(self.path, f"frame_{index:06d}.png"), "wb") as f:
+            f.write(PNG_SIGNATURE)
+            f.write(_png_chunk(b"IHDR", header))
+            f.write(_png_chunk(b"IDAT", zlib.compress(self._rgb, PNG_COMPRESSION)))
+            f.write(_png_chunk(b"IEND", b""))
+
+    def _open_raw(self):
+        self._file = open(self.path, "w+b")
+        self._file.write(RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, self.width, self.height, self.fps, 0))
+        self._grow_raw()
+
+    def _grow_raw(self):
+        self._capacity += RAW_GROW_FRAMES
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(RAW_HEADER.size + self._capacity * self.width * self.height * 3)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    # Convert straight into the mapped file
+    def _write_raw(self, slot):
+        if self.written == self._capacity:
+            self._grow_raw()
+        frame_bytes = self.width * self.height * 3
+        start = RAW_HEADER.size + self.written * frame_bytes
+        target = np.frombuffer(self._map, dtype=np.uint8, count=frame_bytes, offset=start)
+        self._to_rgb(slot, target.reshape(self.height, self.width, 3))
+        del target
+
+    def _close_raw(self):
+        self._map.close()
+        self._map = None
+        self._file.truncate(RAW_HEADER.size + self.written * self.width * self.height * 3)
+        self._file.seek(0)
+        self._file.write(RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, self.width, self.height, self.fps, self.written))
+        self._file.close()
+        self._file = None
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def load_raw(path):
+    """Memory-map a raw recording as a (frames, height, width, 3) uint8 array."""
+    with open(path, "rb") as f:
+        magic, version, width, height, fps, frames = RAW_HEADER.unpack(f.read(RAW_HEADER.size))
+    if magic != RAW_MAGIC or version != RAW_VERSION:
+        raise ValueError(f"{path} is not a raw screen recording")
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=RAW_HEADER.size,
+                     shape=(frames, height, width, 3)), fps
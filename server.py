@@ -0,0 +1,215 @@
+"""Authoritative multiplayer server on UDP.
+
+The server owns the only real ``MatchState``. Clients send their inputs;
+the server steps the match at the fixed simulation rate and sends every
+client a snapshot each tick, delta-compressed against the newest tick that
+client acknowledged (see ``netcode.py``). Clients that go quiet for
+``timeout`` seconds are dropped.
+
+Run from the repository root, then start clients with ``client.py``:
+
+    python server.py --port 5757 --birds 12
+"""
+import argparse
+import collections
+import dataclasses
+import logging
+import socket
+import sys
+import time
+
+import netcode
+from game_state import FPS, GameConfig
+from match import MAX_PLAYERS, MatchState
+from replay import unpack_inputs
+
+log = logging.getLogger(__name__)
+
+# Inputs buffered per client; anything older is dropped to bound latency
+MAX_QUEUED_INPUTS = 4
+
+
+@dataclasses.dataclass
+class Connection:
+    """A client as the server sees it."""
+    address: tuple
+    player_id: int
+    last_heard: float
+    ack: int = netcode.NO_BASELINE  # newest snapshot tick the client has
+    input_seq: int = 0  # newest input sequence queued
+    applied_seq: int = 0  # sequence of the input used in the latest tick
+    inputs: collections.deque = dataclasses.field(
+        default_factory=lambda: collections.deque(maxlen=MAX_QUEUED_INPUTS))
+
+
+# Most birds whose full snapshot still fits one datagram with a full match
+def max_birds():
+    fixed = netcode.max_snapshot_size(0, MAX_PLAYERS)
+    return (netcode.MAX_DATAGRAM - fixed) // (netcode.max_snapshot_size(1, 0) - netcode.max_snapshot_size(0, 0))
+
+
+class MatchServer:
+    """Runs a ``MatchState`` and keeps every connected client in sync.
+
+    ``tick()`` does one whole server step: read pending packets, apply one
+    queued input per client, step the match, then encode and send the
+    snapshots. ``serve()`` calls it at the simulation rate. Tick timings
+    and bandwidth are kept in ``tick_ms``, ``bytes_sent`` and
+    ``packets_sent``; ``live_ticks`` counts the ticks that stepped a match
+    still in play.
+    """
+
+    def __init__(self, host="127.0.0.1", port=netcode.DEFAULT_PORT, config=None, seed=None, history=64, timeout=5.0):
+        num_birds = (config or GameConfig()).num_birds
+        if num_birds > max_birds():
+            raise ValueError(f"{num_birds} birds don't fit in one snapshot datagram; the most is {max_birds()}")
+        self.match = MatchState(config, seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.timeout = timeout
+        self.connections = {}
+        self.frames = collections.OrderedDict()  # tick -> Frame, the last `history` ticks
+        self.history = history
+        self.ticks = 0
+        self.live_ticks = 0
+        self.tick_ms = collections.deque(maxlen=36000)
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.full_snapshots = 0
+
+    def close(self):
+        self.sock.close()
+
+    def _send(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+        except (BlockingIOError, ConnectionRefusedError):
+            return  # a full send buffer or a vanished client: it's UDP, drop it
+        except OSError as exc:
+            log.warning("dropped a %d-byte packet to %s:%d: %s", len(data), *address, exc)
+            return
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+
+    def poll(self):
+        now = time.perf_counter()
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            kind = netcode.packet_kind(data)
+            connection = self.connections.get(address)
+            if kind == netcode.JOIN:
+                if connection is None:
+                    player_id = self.match.add_player()
+                    if player_id is None:
+                        continue
+                    connection = self.connections[address] = Connection(address, player_id, now)
+                    log.info("player %d joined from %s:%d", player_id, *address)
+                # Also answers a repeated JOIN whose WELCOME got lost
+                self._send(netcode.encode_welcome(connection.player_id,
+                                                  dataclasses.asdict(self.match.config)), address)
+            elif connection is None:
+                continue
+            elif kind == netcode.INPUT:
+                seq, ack, bits = netcode.decode_input(data)
+                connection.last_heard = now
+                if ack != netcode.NO_BASELINE and (connection.ack == netcode.NO_BASELINE or ack > connection.ack):
+                    connection.ack = ack
+                if seq > connection.input_seq:
+                    connection.input_seq = seq
+                    connection.inputs.append((seq, unpack_inputs(bits)))
+            elif kind == netcode.LEAVE:
+                self._drop(connection)
+
+    def _drop(self, connection):
+        del self.connections[connection.address]
+        self.match.remove_player(connection.player_id)
+        log.info("player %d left", connection.player_id)
+
+    def tick(self):
+        start = time.perf_counter()
+        self.poll()
+        for connection in list(self.connections.values()):
+            if start - connection.last_heard > self.timeout:
+                self._drop(connection)
+
+        # One queued input per client per tick; an empty queue repeats the last one
+        players = self.match.players
+        for connection in self.connections.values():
+            player = players[connection.player_id]
+            if connection.inputs:
+                connection.applied_seq, player.inputs = connection.inputs.popleft()
+        if not self.match.game_over:
+            self.live_ticks += 1
+        self.match.step()
+
+        previous = self.frames[next(reversed(self.frames))] if self.frames else None
+        statics = ((previous.bird_y, previous.bird_color)
+                   if previous is not None and previous.epoch == self.match.epoch else None)
+        frame = netcode.Frame.capture(self.match, self.ticks, statics)
+        self.frames[frame.tick] = frame
+        while len(self.frames) > self.history:
+            self.frames.popitem(last=False)
+
+        # Clients acking the same tick get the same body, encoded once
+        bodies = {}
+        for connection in self.connections.values():
+            baseline = self.frames.get(connection.ack)
+            key = baseline.tick if baseline is not None and baseline.epoch == frame.epoch else None
+            body = bodies.get(key)
+            if body is None:
+                body = bodies[key] = netcode.encode_frame(frame, baseline if key is not None else None)
+            if key is None:
+                self.full_snapshots += 1
+            self._send(netcode.snapshot_header(connection.player_id, connection.applied_seq) + body,
+                       connection.address)
+
+        self.ticks += 1
+        self.tick_ms.append((time.perf_counter() - start) * 1000)
+
+    def serve(self, duration=None):
+        """Tick at the simulation rate until interrupted or ``duration`` seconds pass."""
+        interval = 1 / FPS
+        start = next_tick = time.perf_counter()
+        while duration is None or time.perf_counter() - start < duration:
+            self.tick()
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -interval:
+                # Too far behind to catch up: skip the missed ticks
+                next_tick = time.perf_counter()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=netcode.DEFAULT_PORT)
+    parser.add_argument("--birds", type=int, default=GameConfig.num_birds)
+    parser.add_argument("--duration", type=int, default=GameConfig.game_duration, help="game length, seconds")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    if not 0 <= args.birds <= max_birds():
+        parser.error(f"--birds must be between 0 and {max_birds()}, so a snapshot fits in one datagram")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    server = MatchServer(args.host, args.port, GameConfig(num_birds=args.birds, game_duration=args.duration),
+                         seed=args.seed)
+    log.info("serving on %s:%d", *server.address)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Binary snapshots of a ``GameState`` for rewind and rollback.
+
+``snapshot(state)`` packs everything that decides how a game plays on (the
+player, timers, score, trail, power-ups, every bird, the chunk bookkeeping
+of scrolling worlds and the random generator) into one ``bytes`` object,
+and ``restore(state, data)`` puts it back into a ``GameState`` built with
+the same config. Broadphase grids are derived data and rebuilt on restore.
+
+``SnapshotRing`` keeps the last N snapshots, one per simulated frame, for
+rewinding a game or rolling it back to an earlier frame and re-simulating.
+A default six-bird game packs into about 3 KB; snapshot and restore each
+take well under 100 microseconds.
+"""
+import struct
+from collections import deque
+
+import numpy as np
+
+from birds import Flock
+from game_state import POWER_UP_COLOR
+
+MAGIC = b"BCSS"
+VERSION = 1
+
+# magic, version, seed, frame, player x/y, speed, evolution, score, game over,
+# victory, active power-up, power-up end time, birds captured, next
+# power-up id, camera x/y, trail points, power-ups, birds, has gauss_next,
+# gauss_next, Mersenne Twister position
+_HEADER = struct.Struct("<4sBQqqqibq??BdqqqqHHq?dI")
+_RNG_KEY = struct.Struct("<624I")
+_TRAIL_POINT = struct.Struct("<qq")
+_POWER_UP = struct.Struct("<qBqqi")
+_COUNT = struct.Struct("<q")
+
+POWER_UP_TYPES = (None, "speed", "invincibility")
+
+# dtype of every per-bird array, in Flock.FIELDS order
+_BIRD_DTYPES = [getattr(Flock(0), name).dtype for name in Flock.FIELDS]
+
+
+class SnapshotError(ValueError):
+    """Raised when bytes aren't a snapshot this version can restore."""
+
+
+def snapshot(state):
+    """Pack the full simulation state of ``state`` into bytes."""
+    version, key, gauss_next = state.rng.getstate()
+    birds = state.birds
+    parts = [
+        _HEADER.pack(
+            MAGIC, VERSION, state.seed, state.frame, state.player_x, state.player_y, state.player_speed,
+            state.player_evolution, state.score, state.game_over, state.victory,
+            POWER_UP_TYPES.index(state.power_up_active), state.power_up_end_time, state.birds_captured,
+            state._next_power_up_id, state.camera_x, state.camera_y, len(state.trail),
+            len(state.power_ups), len(birds), gauss_next is not None, gauss_next or 0.0, key[-1]),
+        _RNG_KEY.pack(*key[:-1]),
+    ]
+    for x, y in state.trail:
+        parts.append(_TRAIL_POINT.pack(x, y))
+    for power_up in state.power_ups:
+        parts.append(_POWER_UP.pack(power_up['id'], POWER_UP_TYPES.index(power_up['type']),
+                                    power_up['x'], power_up['y'], power_up['radius']))
+    for name in Flock.FIELDS:
+        parts.append(getattr(birds, name).tobytes())
+
+    chunks = state.chunks
+    if chunks is not None:
+        parts.append(_COUNT.pack(chunks.seed))
+        parts.append(chunks.ids.tobytes())
+        for ids in (chunks.loaded, chunks.captured):
+            parts.append(_COUNT.pack(len(ids)))
+            parts.append(np.fromiter(ids, dtype=np.int64, count=len(ids)).tobytes())
+    return b"".join(parts)
+
+
+def restore(state, data):
+    """Overwrite ``state`` with a snapshot taken from a game with the same config."""
+    if len(data) < _HEADER.size or data[:4] != MAGIC:
+        raise SnapshotError("not a game snapshot")
+    (_, version, state.seed, state.frame, state.player_x, state.player_y, state.player_speed,
+     state.player_evolution, state.score, state.game_over, state.victory, power_up_active,
+     state.power_up_end_time, state.birds_captured, state._next_power_up_id, state.camera_x,
+     state.camera_y, trail_length, power_up_count, bird_count, has_gauss, gauss_next,
+     position) = _HEADER.unpack_from(data)
+    if version != VERSION:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+    state.power_up_active = POWER_UP_TYPES[power_up_active]
+    offset = _HEADER.size
+
+    key = _RNG_KEY.unpack_from(data, offset) + (position,)
+    state.rng.setstate((3, key, gauss_next if has_gauss else None))
+    offset += _RNG_KEY.size
+
+    state.trail.clear()
+    for _ in range(trail_length):
+        state.trail.append(_TRAIL_POINT.unpack_from(data, offset))
+        offset += _TRAIL_POINT.size
+
+    state.power_ups = []
+    state.power_up_grid.clear()
+    for _ in range(power_up_count):
+        power_up_id, kind, x, y, radius = _POWER_UP.unpack_from(data, offset)
+        offset += _POWER_UP.size
+        state.power_ups.append({
+            'id': power_up_id,
+            'type': POWER_UP_TYPES[kind],
+            'x': x,
+            'y': y,
+            'radius': radius,
+            'color': POWER_UP_COLOR,
+        })
+        state.power_up_grid.insert(power_up_id, x, y)
+
+    birds = Flock(0)
+    for name, dtype in zip(Flock.FIELDS, _BIRD_DTYPES):
+        array = np.frombuffer(data, dtype=dtype, count=bird_count, offset=offset)
+        setattr(birds, name, array.copy())
+        offset += array.nbytes
+    previous, state.birds = state.birds, birds
+
+    chunks = state.chunks
+    if chunks is not None:
+        chunks.flock = birds
+        (chunks.seed,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        chunks.ids = np.frombuffer(data, dtype=np.int64, count=bird_count, offset=offset).copy()
+        offset += chunks.ids.nbytes
+        sets = []
+        for _ in range(2):
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            sets.append(set(np.frombuffer(data, dtype=np.int64, count=count, offset=offset).tolist()))
+            offset += count * 8
+        chunks.loaded, chunks.captured = sets
+
+    state.events = []
+    if chunks is None and len(previous) == len(birds):
+        state._reindex_birds(previous)
+    else:
+        state._index_birds()
+
+
+class SnapshotRing:
+    """The last ``capacity`` snapshots of a game, oldest dropped first.
+
+    ``push()`` once per simulated frame. ``rewind()`` steps back a number
+    of pushes; ``rollback()`` returns to a given frame number, typically to
+    re-simulate from there with corrected inputs. Both discard the
+    snapshots after the one they restore.
+    """
+
+    def __init__(self, capacity=600):
+        self.snapshots = deque(maxlen=capacity)  # (frame, data), oldest first
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def clear(self):
+        self.snapshots.clear()
+
+    def push(self, state):
+        self.snapshots.append((state.frame, snapshot(state)))
+
+    def rewind(self, state, frames=1):
+        """Restore the snapshot ``frames`` pushes back; False if the ring isn't that deep."""
+        if frames >= len(self.snapshots):
+            return False
+        for _ in range(frames):
+            self.snapshots.pop()
+        restore(state, self.snapshots[-1][1])
+        return True
+
+    def rollback(self, state, frame):
+        """Restore the latest snapshot taken at ``frame``; False if none is kept."""
+        for back, (snapshot_frame, _) in enumerate(reversed(self.snapshots)):
+            if snapshot_frame == frame:
+                return self.rewind(state, back)
+        return False
@@ -0,0 +1,66 @@
+import math
+
+
+class SpatialHash:
+    """Uniform-grid broadphase mapping items to the cell under their position.
+
+    Items are any hashable keys (the game uses list indices). ``move()`` only
+    touches the cell sets when an item actually crosses a cell boundary, so
+    keeping the grid in sync with slowly drifting birds is cheap. ``query()``
+    returns every item in the cells overlapping a circle; callers still do
+    the exact distance test themselves.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._item_cells = {}
+
+    def __len__(self):
+        return len(self._item_cells)
+
+    def __contains__(self, item):
+        return item in self._item_cells
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def clear(self):
+        self.cells.clear()
+        self._item_cells.clear()
+
+    def insert(self, item, x, y):
+        cell = self._cell(x, y)
+        self._item_cells[item] = cell
+        self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        cell = self._item_cells.pop(item, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        bucket.discard(item)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, item, x, y):
+        cell = self._cell(x, y)
+        old = self._item_cells.get(item)
+        if cell == old:
+            return
+        if old is not None:
+            self.remove(item)
+        self._item_cells[item] = cell
+        self.cells.setdefault(cell, set()).add(item)
+
+    def query(self, x, y, radius):
+        min_cx, min_cy = self._cell(x - radius, y - radius)
+        max_cx, max_cy = self._cell(x + radius, y + radius)
+        found = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
@@ -0,0 +1,198 @@
+import math
+import random
+
+import pygame
+
+from birds import bird_width, bird_height
+from game_state import player_radius
+from render_cache import optimize_surface
+
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+
+# Padding around each sprite so wings, ears and the aura never get clipped
+BIRD_SPRITE_MARGIN = 10
+PLAYER_SPRITE_MARGIN = 8
+
+# Number of pre-baked phoenix flame-aura frames and how long each is shown
+phoenix_aura_frames = 8
+phoenix_aura_hold = 3  # rendered frames per aura frame
+
+
+# Function to draw a bird centred on (x, y)
+def draw_bird_shape(surface, x, y, color, frame, direction):
+    # Bird body
+    pygame.draw.ellipse(surface, color, (x - bird_width//2, y - bird_height//2, bird_width, bird_height))
+
+    # Bird head
+    head_radius = bird_height // 3
+    head_x = x + direction * (bird_width//2 - head_radius//2)
+    pygame.draw.circle(surface, color, (head_x, y - bird_height//6), head_radius)
+
+    # Bird eye
+    eye_x = head_x + direction * (head_radius//2)
+    pygame.draw.circle(surface, BLACK, (eye_x, y - bird_height//4), 3)
+
+    # Bird wings (animated)
+    wing_y = y + (5 if frame == 0 else -5)
+    wing_points = [
+        (x, y),
+        (x - direction * (bird_width//4), wing_y - bird_height//2),
+        (x + direction * (bird_width//4), wing_y - bird_height//2)
+    ]
+    pygame.draw.polygon(surface, color, wing_points)
+
+
+# Function to draw the player centred on (x, y) based on evolution level;
+# with ``jitter`` None the phoenix's flames are drawn still
+def draw_player_shape(surface, x, y, evolution, jitter=random, flames=12):
+    if evolution == 0:  # Circle (default)
+        pygame.draw.circle(surface, RED, (x, y), player_radius)
+
+    elif evolution == 1:  # Cat
+        # Cat body (circle)
+        pygame.draw.circle(surface, (200, 100, 100), (x, y), player_radius)
+
+        # Cat ears
+        pygame.draw.polygon(surface, (200, 100, 100), [
+            (x - player_radius//2, y - player_radius),
+            (x - player_radius, y - player_radius*1.5),
+            (x, y - player_radius)
+        ])
+        pygame.draw.polygon(surface, (200, 100, 100), [
+            (x + player_radius//2, y - player_radius),
+            (x + player_radius, y - player_radius*1.5),
+            (x, y - player_radius)
+        ])
+
+        # Cat eyes
+        pygame.draw.circle(surface, BLACK, (x - player_radius//2, y - player_radius//4), 4)
+        pygame.draw.circle(surface, BLACK, (x + player_radius//2, y - player_radius//4), 4)
+
+        # Cat mouth
+        pygame.draw.line(surface, BLACK, (x - player_radius//3, y + player_radius//3),
+                        (x + player_radius//3, y + player_radius//3), 2)
+
+    elif evolution == 2:  # Hawk
+        # Hawk body
+        pygame.draw.circle(surface, (139, 69, 19), (x, y), player_radius)
+
+        # Hawk wings
+        pygame.draw.polygon(surface, (120, 60, 10), [
+            (x, y),
+            (x - player_radius*1.5, y),
+            (x - player_radius, y - player_radius//2)
+        ])
+        pygame.draw.polygon(surface, (120, 60, 10), [
+            (x, y),
+            (x + player_radius*1.5, y),
+            (x + player_radius, y - player_radius//2)
+        ])
+
+        # Hawk beak
+        pygame.draw.polygon(surface, (255, 200, 0), [
+            (x, y),
+            (x - player_radius//3, y + player_radius//3),
+            (x + player_radius//3, y + player_radius//3)
+        ])
+
+        # Hawk eyes
+        pygame.draw.circle(surface, BLACK, (x - player_radius//3, y - player_radius//4), 3)
+        pygame.draw.circle(surface, BLACK, (x + player_radius//3, y - player_radius//4), 3)
+
+    elif evolution == 3:  # Phoenix
+        # Phoenix body
+        pygame.draw.circle(surface, (255, 100, 0), (x, y), player_radius)
+
+        # Phoenix flame aura
+        for i in range(flames):
+            angle = i * (2 * math.pi / flames)
+            end_x = x + math.cos(angle) * (player_radius * 1.5)
+            end_y = y + math.sin(angle) * (player_radius * 1.5)
+            if jitter is not None:
+                mid_x = x + math.cos(angle) * (player_radius * 1.2) + jitter.randint(-5, 5)
+                mid_y = y + math.sin(angle) * (player_radius * 1.2) + jitter.randint(-5, 5)
+            else:
+                # Still flames lean half a flame over instead, or they'd be lines
+                mid_x = x + math.cos(angle + math.pi / flames) * (player_radius * 1.2)
+                mid_y = y + math.sin(angle + math.pi / flames) * (player_radius * 1.2)
+
+            # Draw flame
+            pygame.draw.polygon(surface, (255, 200, 0), [(x, y), (mid_x, mid_y), (end_x, end_y)])
+
+        # Phoenix eyes
+        pygame.draw.circle(surface, (255, 255, 255), (x - player_radius//3, y - player_radius//4), 4)
+        pygame.draw.circle(surface, (255, 255, 255), (x + player_radius//3, y - player_radius//4), 4)
+        pygame.draw.circle(surface, (0, 0, 0), (x - player_radius//3, y - player_radius//4), 2)
+        pygame.draw.circle(surface, (0, 0, 0), (x + player_radius//3, y - player_radius//4), 2)
+
+
+class SpriteAtlas:
+    """Lazily rendered sprites for every bird and player variant.
+
+    Birds are keyed by color, wing frame and direction; the player by
+    evolution level, with the phoenix getting ``phoenix_aura_frames``
+    pre-baked aura variants so its flicker costs nothing per frame. Each
+    variant is drawn once and then only blitted. With ``scale`` other than
+    1, sprites are drawn at full size and then smooth-scaled.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._birds = {}
+        self._players = {}
+        self._bird_size = (bird_width // 2 + BIRD_SPRITE_MARGIN, bird_height // 2 + BIRD_SPRITE_MARGIN)
+        reach = int(player_radius * 1.5) + PLAYER_SPRITE_MARGIN
+        self._player_size = (reach, reach)
+        self._bird_anchor = self._scaled_anchor(self._bird_size)
+        self._player_anchor = self._scaled_anchor(self._player_size)
+        self._aura_rng = random.Random(0)
+
+    def _scaled_anchor(self, half_size):
+        return tuple(round(2 * half * self.scale) // 2 for half in half_size)
+
+    # Offset from an entity's centre to the top-left corner of its sprite
+    @property
+    def bird_anchor(self):
+        return self._bird_anchor
+
+    @property
+    def player_anchor(self):
+        return self._player_anchor
+
+    def bird(self, color, frame, direction):
+        key = (color, frame, direction)
+        sprite = self._birds.get(key)
+        if sprite is None:
+            ax, ay = self._bird_size
+            sprite = pygame.Surface((ax * 2, ay * 2), pygame.SRCALPHA)
+            draw_bird_shape(sprite, ax, ay, color, frame, direction)
+            sprite = self._finish(sprite, self._bird_anchor)
+            self._birds[key] = sprite
+        return sprite
+
+    # ``simple_aura`` swaps the phoenix's flickering aura for one still frame
+    def player(self, evolution, tick=0, simple_aura=False):
+        simple = simple_aura and evolution == 3
+        aura_frame = (tick // phoenix_aura_hold) % phoenix_aura_frames if evolution == 3 and not simple else 0
+        key = (evolution, aura_frame, simple)
+        sprite = self._players.get(key)
+        if sprite is None:
+            ax, ay = self._player_size
+            sprite = pygame.Surface((ax * 2, ay * 2), pygame.SRCALPHA)
+            if simple:
+                draw_player_shape(sprite, ax, ay, evolution, jitter=None, flames=6)
+            else:
+                draw_player_shape(sprite, ax, ay, evolution, self._aura_rng)
+            sprite = self._finish(sprite, self._player_anchor)
+            self._players[key] = sprite
+        return sprite
+
+    def _finish(self, sprite, anchor):
+        if self.scale != 1:
+            sprite = pygame.transform.smoothscale(sprite, (anchor[0] * 2, anchor[1] * 2))
+        return optimize_surface(sprite)
+
+    def clear(self):
+        self._birds.clear()
+        self._players.clear()
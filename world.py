@@ -0,0 +1,103 @@
+"""Chunked bird population for worlds bigger than the screen.
+
+The world is cut into square chunks. A chunk's birds are generated from the
+world seed and the chunk's index the first time the view comes near it, and
+dropped again once the view is well away, so only the birds around the
+camera ever exist and their number doesn't grow with the world. Captures
+are remembered by bird id, which keeps a reloaded chunk from bringing back
+birds that were already caught.
+"""
+import numpy as np
+
+from birds import Flock, bird_margin
+
+CHUNK_SIZE = 400
+
+# Chunks load once they come within LOAD_MARGIN of the view and unload once
+# they are more than UNLOAD_MARGIN away; the gap stops a player pacing along
+# a chunk edge from reloading it every frame
+LOAD_MARGIN = 100
+UNLOAD_MARGIN = 300
+
+
+class BirdChunks:
+    """The loaded birds of a chunked world as one ``Flock``.
+
+    ``flock`` holds every bird in a loaded chunk and ``ids`` each one's
+    world-wide id (chunk index * birds_per_chunk + bird number). Both are
+    rebuilt by ``stream()`` whenever chunks load or unload; birds that stay
+    loaded keep their state.
+    """
+
+    def __init__(self, seed, world_width, world_height, birds_per_chunk, num_colors, chunk_size=CHUNK_SIZE):
+        self.seed = seed
+        self.world_width = world_width
+        self.world_height = world_height
+        self.birds_per_chunk = birds_per_chunk
+        self.num_colors = num_colors
+        self.chunk_size = chunk_size
+        self.columns = -(-world_width // chunk_size)
+        self.rows = -(-world_height // chunk_size)
+
+        self.loaded = set()
+        self.captured = set()  # ids of captured birds, kept across unloads
+        self.flock = Flock(0)
+        self.ids = np.zeros(0, dtype=np.int64)
+
+    # Indices of the chunks overlapping a rectangle grown by margin
+    def chunks_near(self, left, top, width, height, margin):
+        size = self.chunk_size
+        first_column = max(0, (left - margin) // size)
+        last_column = min(self.columns - 1, (left + width + margin) // size)
+        first_row = max(0, (top - margin) // size)
+        last_row = min(self.rows - 1, (top + height + margin) // size)
+        return {row * self.columns + column
+                for row in range(first_row, last_row + 1)
+                for column in range(first_column, last_column + 1)}
+
+    def stream(self, left, top, width, height):
+        """Load and unload chunks around the view; True if the flock changed."""
+        keep = self.loaded & self.chunks_near(left, top, width, height, UNLOAD_MARGIN)
+        added = self.chunks_near(left, top, width, height, LOAD_MARGIN) - self.loaded
+        if not added and keep == self.loaded:
+            return False
+
+        # Carry over the uncaptured birds of chunks that stay, then append new ones
+        rows = np.isin(self.ids // self.birds_per_chunk, list(keep)) & ~self.flock.captured
+        flocks = [self.flock.take(rows)]
+        ids = [self.ids[rows]]
+        for index in sorted(added):
+            flock, chunk_ids = self._spawn(index)
+            flocks.append(flock)
+            ids.append(chunk_ids)
+
+        self.flock = Flock.concatenate(flocks)
+        self.ids = np.concatenate(ids)
+        self.loaded = keep | added
+        return True
+
+    # Mark a bird of the current flock captured for good
+    def capture(self, i):
+        self.flock.captured[i] = True
+        self.captured.add(int(self.ids[i]))
+
+    # The same birds every time a chunk loads, minus any already captured
+    def _spawn(self, index):
+        row, column = divmod(index, self.columns)
+        left = column * self.chunk_size
+        top = row * self.chunk_size
+        width = min(self.chunk_size, self.world_width - left)
+        height = min(self.chunk_size, self.world_height - top)
+        n = self.birds_per_chunk
+        if width <= 2 * bird_margin or height <= 2 * bird_margin:
+            n = 0
+
+        rng = np.random.default_rng((self.seed, index))
+        flock = Flock.spawn(n, rng, width, height, self.num_colors)
+        flock.x += left
+        flock.y += top
+        ids = index * self.birds_per_chunk + np.arange(n, dtype=np.int64)
+        if self.captured:
+            keep = ~np.isin(ids, list(self.captured))
+            flock, ids = flock.take(keep), ids[keep]
+        return flock, ids